@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, send_file
 from flask_cors import CORS
 import os
 import json
@@ -6,49 +6,67 @@ import threading
 import time
 import logging
 from werkzeug.utils import secure_filename
-
 from dotenv import load_dotenv
-from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 
-from .neural_network import NeuralNetwork
+from .neural_network import NeuralNetwork, DEFAULT_THRESHOLD
+from . import neural_network
+from .model_format import BINARY_EXTENSION, ModelFormatError
+from .chat import ChatService, ChatError
+from .datasets import DatasetRegistry, DatasetError, DatasetNotFoundError, MAX_UPLOAD_BYTES, inspect_csv
+from . import metrics
+from . import profiling
+from . import replay_export
+from . import evaluation
+
+# Read backend/.env before any setting below (LOG_LEVEL, CHAT_*) is looked up
+load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env'))
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
-# --- Load Environment Variables ---
-load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env')) # Look for .env in parent (backend) directory
-hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
-
-if not hf_token:
-    logger.warning("Hugging Face API token not found. Chatbot functionality will be limited.")
-    chat_model = None
-else:
-    try:
-        # --- Initialize Hugging Face LLM ---
-        llm = HuggingFaceEndpoint(
-            repo_id="mistralai/Mistral-7B-Instruct-v0.2",
-            task="conversational", 
-            max_new_tokens=512,
-            temperature=0.7,
-            repetition_penalty=1.1,
-            huggingfacehub_api_token=hf_token
-        )
-        chat_model = ChatHuggingFace(llm=llm)
-        logger.info("Hugging Face Chat Model initialized successfully.")
-    except Exception as e:
-        logger.error(f"Failed to initialize Hugging Face model: {e}")
-        chat_model = None
-# --- End LLM Initialization ---
+# --- Chatbot ---
+# The chat chain (and langchain itself) is built on the first /api/chat
+# request. CHAT_MODEL_BACKEND=local swaps in an offline stand-in model.
+chat_service = ChatService(
+    max_workers=int(os.getenv('CHAT_MAX_WORKERS', 4)),
+    max_pending=int(os.getenv('CHAT_MAX_PENDING', 8)),
+    timeout=float(os.getenv('CHAT_TIMEOUT_SECONDS', 60))
+)
+# --- End Chatbot ---
 
 app = Flask(__name__)
 CORS(app)
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # Label by route endpoint rather than raw path to keep label cardinality bounded
+        endpoint = request.endpoint or 'unmatched'
+        method = request.method
+        metrics.REQUESTS.inc(method=method, endpoint=endpoint, status=str(response.status_code))
+        
+        def observe():
+            metrics.REQUEST_SECONDS.observe(time.perf_counter() - started, method=method, endpoint=endpoint)
+        
+        # A streamed body (/api/chat/stream) is still being generated at this
+        # point, so its latency is recorded once the server closes the response
+        if response.is_streamed:
+            response.call_on_close(observe)
+        else:
+            observe()
+    return response
+
 # Initialize global variables
-nn = NeuralNetwork()
+nn = NeuralNetwork(eda_cache_dir='backend/static/cache')
 df = None
+datasets = DatasetRegistry('backend/static/datasets')
+exports = replay_export.ExportJobs('backend/static/sessions', 'backend/static/exports')
 training_thread = None
 training_status = {
     'is_training': False,
@@ -66,6 +84,43 @@ training_status = {
 os.makedirs('backend/static/models', exist_ok=True)
 os.makedirs('backend/static/sessions', exist_ok=True)
 
+def select_dataset(dataset_id=None):
+    """
+    Make a registered dataset the active one, or the bundled CSV when no ID is
+    given. Switching datasets discards the trained model. Returns an error
+    response or None.
+    """
+    global df
+    
+    dataset_id = dataset_id or None
+    if df is not None and dataset_id == nn.dataset_id:
+        return None
+    if training_status['is_training']:
+        return jsonify({
+            'success': False,
+            'message': 'Cannot switch datasets while training is in progress'
+        }), 409
+    
+    if dataset_id is None:
+        df = nn.load_and_preprocess_data()
+        return None
+    try:
+        meta, arrays = datasets.load(dataset_id)
+    except DatasetNotFoundError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 404
+    df = nn.load_dataset(meta, arrays)
+    return None
+
+def read_upload(field):
+    """Bytes of an uploaded file, at most MAX_UPLOAD_BYTES + 1 of them."""
+    file = request.files.get(field)
+    if file is None or file.filename == '':
+        raise DatasetError('No file provided')
+    return file.stream.read(MAX_UPLOAD_BYTES + 1)
+
 # Callback function for training
 def training_callback(status):
     global training_status
@@ -75,20 +130,71 @@ def training_callback(status):
     # Save current status to a session file
     session_id = training_status.get('session_id')
     if session_id:
-        with open(f'backend/static/sessions/{session_id}_partial.json', 'w') as f:
+        with metrics.span('session_write', kind='partial'), \
+                open(f'backend/static/sessions/{session_id}_partial.json', 'w') as f:
             json.dump(training_status, f)
 
+def warm_up(chat=True):
+    """
+    Import the heavy dependencies, load the dataset and (optionally) build the
+    chat model now instead of on the first request that needs them.
+    """
+    global df, nn
+    
+    started = time.perf_counter()
+    neural_network.warm_up()
+    if df is None:
+        df = nn.load_and_preprocess_data()
+    if chat:
+        chat_service.get_chain()
+    elapsed = time.perf_counter() - started
+    logger.info(f"Warm-up finished in {elapsed:.2f}s")
+    return elapsed
+
+@app.route('/api/warmup', methods=['POST'])
+def warmup():
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        elapsed = warm_up(chat=bool(data.get('chat', True)))
+        return jsonify({
+            'success': True,
+            'data': {'elapsed_seconds': elapsed}
+        })
+    except Exception as e:
+        logger.error(f"Error during warm-up: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f"Error during warm-up: {str(e)}"
+        }), 500
+
 @app.route('/api/eda', methods=['GET'])
 def get_eda():
     global df, nn
     
     try:
-        # Load and preprocess data if not already done
-        if df is None:
-            df = nn.load_and_preprocess_data()
+        # Describe the requested dataset (the bundled CSV when omitted) without
+        # making it the active one, which would swap the data under the model
+        dataset_id = request.args.get('dataset_id') or None
+        meta = None
+        if df is not None and dataset_id == nn.dataset_id:
+            frame = df
+            if dataset_id is not None:
+                meta = datasets.get(dataset_id)
+        elif dataset_id is None:
+            frame = neural_network.read_bundled_dataset()
+        else:
+            try:
+                meta, arrays = datasets.load(dataset_id)
+            except DatasetNotFoundError as e:
+                return jsonify({
+                    'success': False,
+                    'message': str(e)
+                }), 404
+            frame = neural_network.dataset_frame(meta, arrays)
         
         # Get EDA stats and plots
-        stats, plots = nn.get_eda_stats(df)
+        stats, plots = nn.get_eda_stats(frame, meta)
         
         return jsonify({
             'success': True,
@@ -119,13 +225,21 @@ def train_model():
     data = request.json
     learning_rate = float(data.get('learning_rate', 0.01))
     epochs = int(data.get('epochs', 100))
+    boundary_format = data.get('boundary_format', 'png')
+    if boundary_format not in ('png', 'grid'):
+        return jsonify({
+            'success': False,
+            'message': "boundary_format must be 'png' or 'grid'"
+        }), 400
+    profile = bool(data.get('profile', False))
     
     # Generate a unique session ID
     session_id = str(int(time.time()))
     
-    # Load and preprocess data if not already done
-    if df is None:
-        df = nn.load_and_preprocess_data()
+    # Use the requested dataset, or the bundled CSV when none is given
+    error = select_dataset(data.get('dataset_id'))
+    if error is not None:
+        return error
     
     # Initialize parameters - architecture is fixed at [2, 2, 1]
     nn.initialize_parameters()
@@ -152,6 +266,9 @@ def train_model():
             'learning_rate': learning_rate,
             'epochs': epochs,
         },
+        'boundary_format': boundary_format,
+        'profile': profile,
+        'dataset_id': nn.dataset_id,
         'current_weights': initial_weights,
         'current_biases': initial_biases,
         'decision_boundary': None
@@ -160,25 +277,49 @@ def train_model():
     # Start training in a separate thread
     def train_thread():
         try:
-            history = nn.train(
-                learning_rate=learning_rate, 
-                epochs=epochs,
-                callback=training_callback
-            )
+            train_kwargs = {
+                'learning_rate': learning_rate,
+                'epochs': epochs,
+                'callback': training_callback,
+                'boundary_format': boundary_format
+            }
+            if profile:
+                # Profile artifacts are stored next to the session files
+                history, profiler, profile_summary = profiling.run_profiled(nn.train, **train_kwargs)
+                profiling.write_profile(
+                    profiler, profile_summary,
+                    f'backend/static/sessions/{session_id}.prof',
+                    f'backend/static/sessions/{session_id}_profile.json'
+                )
+                logger.info(f"Saved training profile for session {session_id}")
+            else:
+                history = nn.train(**train_kwargs)
             
             # When training completes
             training_status['is_training'] = False
             training_status['progress_percentage'] = 100
             
             # Save final model
-            model_path = nn.save_model(f'backend/static/models/model_{session_id}.json')
+            with metrics.span('model_write'):
+                model_path = nn.save_model(f'backend/static/models/model_{session_id}{BINARY_EXTENSION}')
+            
+            # Boundary frames one per line, for replay export; written before the
+            # session file so a listed session always has its frames
+            with metrics.span('session_write', kind='frames'):
+                replay_export.write_frame_log(
+                    replay_export.frame_log_path(f'backend/static/sessions/{session_id}.json'), history)
             
             # Save complete training session
-            with open(f'backend/static/sessions/{session_id}.json', 'w') as f:
+            with metrics.span('session_write', kind='final'), \
+                    open(f'backend/static/sessions/{session_id}.json', 'w') as f:
                 session_data = {
                     'session_id': session_id,
                     'hyperparameters': training_status['hyperparameters'],
-                    'history': history
+                    'boundary_format': boundary_format,
+                    'profiled': profile,
+                    'dataset_id': training_status['dataset_id'],
+                    # Frames are stored once, in the frame log written above
+                    'history': replay_export.session_history(history)
                 }
                 json.dump(session_data, f)
                 
@@ -207,6 +348,19 @@ def get_training_status():
         'data': training_status
     })
 
+@app.route('/api/train/boundary-points', methods=['GET'])
+def get_boundary_points():
+    """Training points drawn over grid boundaries; fetched once per session."""
+    global nn, training_status
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'session_id': training_status.get('session_id'),
+            'points': nn.boundary_points or []
+        }
+    })
+
 @app.route('/api/predict', methods=['POST'])
 def predict():
     global nn
@@ -218,13 +372,12 @@ def predict():
             'message': 'Model not trained yet'
         })
     
-    # Get input data
+    # Get input data, one value per feature column of the active dataset
     data = request.json
-    cgpa = float(data.get('cgpa', 0))
-    iq = float(data.get('iq', 0))
+    features = [float(data.get(column, 0)) for column in nn.feature_columns]
     
     # Make prediction
-    result = nn.predict_single(cgpa, iq)
+    result = nn.predict_single(*features)
     
     return jsonify({
         'success': True,
@@ -242,8 +395,109 @@ def evaluate():
             'message': 'Model not trained yet'
         })
     
+    # Optional: ?threshold=0.4 to evaluate at another threshold without
+    # changing the serving one, ?curves=true for ROC/PR/calibration data
+    threshold = request.args.get('threshold', type=float)
+    n_bins = request.args.get('bins', 10, type=int)
+    if (threshold is not None and not 0 <= threshold <= 1) or not 1 <= n_bins <= evaluation.MAX_BINS:
+        return jsonify({
+            'success': False,
+            'message': f'threshold must be between 0 and 1 and bins between 1 and {evaluation.MAX_BINS}'
+        }), 400
+    curves = request.args.get('curves', 'false').lower() in ('1', 'true', 'yes')
+    
     # Evaluate on test set
+    results = nn.evaluate(threshold=threshold, curves=curves, n_bins=n_bins)
+    
+    return jsonify({
+        'success': True,
+        'data': results
+    })
+
+@app.route('/api/threshold', methods=['GET', 'POST'])
+def serving_threshold():
+    global nn
+    
+    if request.method == 'GET':
+        return jsonify({
+            'success': True,
+            'data': {'threshold': nn.threshold}
+        })
+    
+    if nn.parameters is None:
+        return jsonify({
+            'success': False,
+            'message': 'Model not trained yet'
+        })
+    
+    # Either a probability in [0, 1] or 'best_f1' to tune it on the training
+    # split; the metrics returned below are then on the held-out test split
+    value = (request.get_json(silent=True) or {}).get('threshold', DEFAULT_THRESHOLD)
+    if value == 'best_f1':
+        threshold = nn.best_f1_threshold()
+    else:
+        try:
+            # float(True) is 1.0, so booleans are rejected explicitly
+            threshold = None if isinstance(value, bool) else float(value)
+        except (TypeError, ValueError):
+            threshold = None
+        if threshold is None or not 0 <= threshold <= 1:
+            return jsonify({
+                'success': False,
+                'message': "threshold must be a number between 0 and 1 or 'best_f1'"
+            }), 400
+    
+    nn.threshold = threshold
     results = nn.evaluate()
+    results['tuned_on'] = 'train' if value == 'best_f1' else None
+    
+    return jsonify({
+        'success': True,
+        'data': results
+    })
+
+@app.route('/api/cross-validate', methods=['POST'])
+def cross_validate():
+    global nn, df
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        k = int(data.get('k', 5))
+        learning_rate = float(data.get('learning_rate', 0.01))
+        epochs = int(data.get('epochs', 100))
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'message': 'k, learning_rate and epochs must be numbers'
+        }), 400
+    if k < 2 or epochs < 1:
+        return jsonify({
+            'success': False,
+            'message': 'k must be at least 2 and epochs at least 1'
+        }), 400
+    
+    # Use the requested dataset, or the bundled CSV when none is given
+    error = select_dataset(data.get('dataset_id'))
+    if error is not None:
+        return error
+    
+    # Reject bad input up front; any error from the folds themselves is a server error
+    try:
+        nn.check_cv_folds(k)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    try:
+        results = nn.cross_validate(k=k, learning_rate=learning_rate, epochs=epochs)
+    except Exception as e:
+        logger.error(f"Error during cross-validation: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f"Error during cross-validation: {str(e)}"
+        }), 500
     
     return jsonify({
         'success': True,
@@ -262,7 +516,7 @@ def save_model():
         })
     
     # Save model
-    filename = f"model_{int(time.time())}.json"
+    filename = f"model_{int(time.time())}{BINARY_EXTENSION}"
     filepath = nn.save_model(f'backend/static/models/{filename}')
     
     return jsonify({
@@ -300,12 +554,81 @@ def load_model():
             'success': success,
             'message': 'Model loaded successfully' if success else 'Failed to load model'
         })
+    except ModelFormatError as e:
+        logger.warning(f"Rejected model file {filename}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'message': f'Invalid model file: {str(e)}'
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': f'Error loading model: {str(e)}'
         })
 
+@app.route('/api/datasets/inspect', methods=['POST'])
+def inspect_dataset():
+    # Column summary of an uploaded CSV, for choosing features and a label
+    try:
+        summary = inspect_csv(read_upload('dataset_file'))
+    except DatasetError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'data': summary
+    })
+
+@app.route('/api/datasets', methods=['GET', 'POST'])
+def dataset_registry():
+    if request.method == 'GET':
+        return jsonify({
+            'success': True,
+            'data': datasets.list()
+        })
+    
+    # feature_columns may be sent as repeated form fields or comma-separated
+    feature_columns = request.form.getlist('feature_columns')
+    if len(feature_columns) == 1:
+        feature_columns = [column.strip() for column in feature_columns[0].split(',')]
+    
+    try:
+        meta = datasets.register(
+            read_upload('dataset_file'),
+            feature_columns,
+            request.form.get('label_column'),
+            name=request.form.get('name') or None
+        )
+    except DatasetError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    logger.info(f"Registered dataset {meta['dataset_id']} ({meta['rows']} rows)")
+    return jsonify({
+        'success': True,
+        'data': meta
+    })
+
+@app.route('/api/datasets/<dataset_id>', methods=['GET'])
+def get_dataset(dataset_id):
+    try:
+        meta = datasets.get(dataset_id)
+    except DatasetNotFoundError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'data': meta
+    })
+
 @app.route('/api/sessions', methods=['GET'])
 def get_sessions():
     sessions = []
@@ -313,7 +636,7 @@ def get_sessions():
     
     if os.path.exists(sessions_dir):
         for filename in os.listdir(sessions_dir):
-            if filename.endswith('.json') and not filename.endswith('_partial.json'):
+            if filename.endswith('.json') and not filename.endswith(('_partial.json', '_profile.json')):
                 session_id = filename.split('.')[0]
                 try:
                     with open(os.path.join(sessions_dir, filename), 'r') as f:
@@ -344,6 +667,14 @@ def replay_session(session_id):
     try:
         with open(session_path, 'r') as f:
             session_data = json.load(f)
+        
+        # Frames live in the session's frame log (older sessions kept them inline)
+        _, frames = replay_export.read_session_frames(session_path)
+        try:
+            session_data['history']['decision_boundaries'] = list(frames)
+        finally:
+            if hasattr(frames, 'close'):
+                frames.close()
             
         return jsonify({
             'success': True,
@@ -355,6 +686,164 @@ def replay_session(session_id):
             'message': f'Error loading session: {str(e)}'
         })
 
+@app.route('/api/sessions/<session_id>/profile', methods=['GET'])
+def get_session_profile(session_id):
+    """Hotspot summary of a session trained with profile: true."""
+    summary_path = f'backend/static/sessions/{secure_filename(session_id)}_profile.json'
+    
+    if not os.path.exists(summary_path):
+        return jsonify({
+            'success': False,
+            'message': 'No profile recorded for this session'
+        }), 404
+    
+    with open(summary_path, 'r') as f:
+        summary = json.load(f)
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'session_id': session_id,
+            'summary': summary,
+            'download_url': f'/api/sessions/{session_id}/profile/download'
+        }
+    })
+
+@app.route('/api/sessions/<session_id>/profile/download', methods=['GET'])
+def download_session_profile(session_id):
+    """Raw cProfile stats, readable with pstats or snakeviz."""
+    stats_path = os.path.abspath(f'backend/static/sessions/{secure_filename(session_id)}.prof')
+    
+    if not os.path.exists(stats_path):
+        return jsonify({
+            'success': False,
+            'message': 'No profile recorded for this session'
+        }), 404
+    
+    return send_file(stats_path, mimetype='application/octet-stream',
+                     as_attachment=True, download_name=f'session_{session_id}.prof')
+
+@app.route('/api/sessions/<session_id>/export', methods=['POST'])
+def export_session(session_id):
+    """Start (or reuse) a GIF/MP4 export of a session's decision boundary frames."""
+    data = request.get_json(silent=True) or {}
+    fmt = data.get('format', 'gif')
+    try:
+        fps = int(data.get('fps', replay_export.DEFAULT_FPS))
+        size = int(data.get('size', replay_export.DEFAULT_SIZE))
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'message': 'fps and size must be numbers'
+        }), 400
+    if not 1 <= fps <= 30 or not 128 <= size <= 1024:
+        return jsonify({
+            'success': False,
+            'message': 'fps must be between 1 and 30 and size between 128 and 1024'
+        }), 400
+    
+    try:
+        job = exports.submit(secure_filename(session_id), fmt, fps, size)
+    except FileNotFoundError:
+        return jsonify({
+            'success': False,
+            'message': 'Session not found'
+        }), 404
+    except replay_export.ExportUnavailableError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 503
+    except replay_export.ExportError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    job['download_url'] = f"/api/exports/{job['job_id']}/download"
+    return jsonify({
+        'success': True,
+        'data': job
+    }), 200 if job['status'] == 'done' else 202
+
+@app.route('/api/exports/<job_id>', methods=['GET'])
+def get_export(job_id):
+    job = exports.status(secure_filename(job_id))
+    if job['status'] == 'unknown':
+        return jsonify({
+            'success': False,
+            'message': 'Export not found'
+        }), 404
+    
+    job['download_url'] = f"/api/exports/{job['job_id']}/download"
+    return jsonify({
+        'success': True,
+        'data': job
+    })
+
+@app.route('/api/exports/<job_id>/download', methods=['GET'])
+def download_export(job_id):
+    job_id = secure_filename(job_id)
+    output_path = os.path.abspath(exports.output_path(job_id))
+    fmt = job_id.rsplit('.', 1)[-1]
+    
+    if fmt not in replay_export.FORMATS or not os.path.exists(output_path):
+        return jsonify({
+            'success': False,
+            'message': 'Export not ready'
+        }), 404
+    
+    return send_file(output_path, mimetype=replay_export.FORMATS[fmt],
+                     as_attachment=True, download_name=f'session_{job_id}')
+
+@app.route('/api/loss-landscape', methods=['POST'])
+def get_loss_landscape():
+    global nn
+    
+    # Check if model is trained
+    if nn.parameters is None:
+        return jsonify({
+            'success': False,
+            'message': 'Model not trained yet'
+        })
+    
+    # A model loaded after a restart has parameters but no training split yet
+    if nn.X_train is None:
+        error = select_dataset()
+        if error is not None:
+            return error
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        span = float(data.get('span', 1.0))
+        resolution = int(data.get('resolution', 41))
+        seed = int(data.get('seed', 0))
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'message': 'span, resolution and seed must be numbers'
+        }), 400
+    
+    try:
+        landscape = nn.loss_landscape(
+            mode=data.get('mode', 'random'),
+            axes=data.get('axes'),
+            span=span,
+            resolution=resolution,
+            seed=seed,
+            trajectory=bool(data.get('trajectory', True))
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    return jsonify({
+        'success': True,
+        'data': landscape
+    })
+
 @app.route('/api/model/state', methods=['GET'])
 def get_model_state():
     global nn, training_status
@@ -384,16 +873,14 @@ def get_model_state():
         }
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Counters and latency histograms in the Prometheus text format."""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 # --- New Chatbot Endpoint ---
 @app.route('/api/chat', methods=['POST'])
 def chat():
-    if not chat_model:
-        logger.error("Chat model not initialized. Check Hugging Face token and setup.")
-        return jsonify({
-            'success': False,
-            'message': 'Chatbot is not available due to initialization error.'
-        }), 503 # Service Unavailable
-
     data = request.json
     user_message = data.get('message')
 
@@ -401,33 +888,51 @@ def chat():
         return jsonify({'success': False, 'message': 'No message provided'}), 400
 
     try:
-        # Simple invocation - you might add history or a template later
-        # Define a simple prompt template
-        template = """
-        You are a helpful AI assistant knowledgeable about neural networks and deep learning, designed to answer questions within the context of the 'Neural Network Visualizer' web application.
-        Keep your answers concise and informative.
-
-        User: {user_input}
-        AI Assistant:"""
-        prompt = PromptTemplate.from_template(template)
-
-        # Create a simple chain
-        chain = prompt | chat_model | StrOutputParser()
-
-        # Invoke the chain
-        ai_response = chain.invoke({"user_input": user_message})
-
-        # Basic cleanup - remove potential instruction remnants if any
-        # (This depends heavily on the model's output format)
-        # ai_response = ai_response.split("AI Assistant:")[-1].strip()
-
+        ai_response = chat_service.ask(user_message)
         return jsonify({'success': True, 'reply': ai_response})
 
+    except ChatError as e:
+        logger.error(f"Chat request failed: {e}")
+        return jsonify({'success': False, 'message': str(e)}), e.status_code
+
     except Exception as e:
         logger.error(f"Error processing chat message: {e}")
         import traceback
         logger.error(traceback.format_exc())
         return jsonify({'success': False, 'message': f'Error getting response from AI: {e}'}), 500
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    Stream the reply as newline-delimited JSON: one {"token": ...} line per
+    chunk, then {"done": true} or {"error": ...}.
+    """
+    data = request.json
+    user_message = data.get('message')
+
+    if not user_message:
+        return jsonify({'success': False, 'message': 'No message provided'}), 400
+
+    try:
+        tokens = chat_service.stream(user_message)
+    except ChatError as e:
+        logger.error(f"Chat stream request failed: {e}")
+        return jsonify({'success': False, 'message': str(e)}), e.status_code
+
+    def generate():
+        try:
+            for token in tokens:
+                yield json.dumps({'token': token}) + '\n'
+            yield json.dumps({'done': True}) + '\n'
+        except Exception as e:
+            logger.error(f"Error streaming chat message: {e}")
+            yield json.dumps({'error': f'Error getting response from AI: {e}'}) + '\n'
+        finally:
+            # Runs when the client disconnects too, which cancels generation
+            tokens.close()
+
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 # --- End Chatbot Endpoint ---
 
 if __name__ == '__main__':
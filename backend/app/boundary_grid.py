@@ -0,0 +1,68 @@
+import base64
+import zlib
+import numpy as np
+
+# Compact transport for decision boundaries: instead of a rendered PNG each
+# frame carries the model's probability grid quantized to uint8 (0-255) at a
+# fixed resolution. Frames in a recorded history are stored as the byte-wise
+# difference (mod 256) from the previous frame, which is mostly zeros between
+# nearby epochs and compresses very well; the client rebuilds the image.
+GRID_RESOLUTION = 128
+KEYFRAME_ENCODING = 'uint8-zlib'
+DELTA_ENCODING = 'uint8-delta-zlib'
+
+
+def quantize(probabilities):
+    return np.rint(np.clip(probabilities, 0.0, 1.0) * 255).astype(np.uint8)
+
+
+MAX_POINTS = 500
+
+
+def grid_points(X, Y, max_points=MAX_POINTS):
+    """
+    Training points as [x, y, label] rows, for drawing on top of the grid.
+    Large datasets are subsampled to max_points evenly spaced rows, which is
+    plenty for a scatter overlay and keeps the payload small.
+    """
+    indices = np.arange(len(Y))
+    if len(indices) > max_points:
+        indices = np.linspace(0, len(Y) - 1, max_points).astype(int)
+    return [[round(float(X[0, i]), 4), round(float(X[1, i]), 4), int(Y[i])] for i in indices]
+
+
+def encode_frame(grid, extent, previous=None, points=None):
+    """
+    Encode a quantized (height, width) grid. With `previous` the frame is a
+    delta against it, otherwise it is a self-contained keyframe.
+    """
+    if previous is None:
+        payload = grid
+        encoding = KEYFRAME_ENCODING
+    else:
+        payload = grid - previous  # uint8 arithmetic wraps, i.e. mod 256
+        encoding = DELTA_ENCODING
+
+    frame = {
+        'encoding': encoding,
+        'width': int(grid.shape[1]),
+        'height': int(grid.shape[0]),
+        'extent': [float(v) for v in extent],
+        'data': base64.b64encode(zlib.compress(np.ascontiguousarray(payload).tobytes(), 6)).decode('ascii')
+    }
+    if points is not None:
+        frame['points'] = points
+    return frame
+
+
+def decode_frame(frame, previous=None):
+    """Inverse of encode_frame; delta frames need the previously decoded grid."""
+    raw = zlib.decompress(base64.b64decode(frame['data']))
+    grid = np.frombuffer(raw, dtype=np.uint8).reshape(frame['height'], frame['width'])
+    if frame['encoding'] == DELTA_ENCODING:
+        if previous is None:
+            raise ValueError('Delta frame without a preceding keyframe')
+        return previous + grid
+    if frame['encoding'] != KEYFRAME_ENCODING:
+        raise ValueError(f"Unknown boundary grid encoding: {frame['encoding']}")
+    return grid.copy()
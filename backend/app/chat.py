@@ -0,0 +1,289 @@
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TEMPLATE = """
+        You are a helpful AI assistant knowledgeable about neural networks and deep learning, designed to answer questions within the context of the 'Neural Network Visualizer' web application.
+        Keep your answers concise and informative.
+
+        User: {user_input}
+        AI Assistant:"""
+
+LOCAL_RESPONSE = (
+    "The chatbot is running with the local stand-in model, so this is a canned reply. "
+    "Set CHAT_MODEL_BACKEND=huggingface and HUGGINGFACEHUB_API_TOKEN to use the real model."
+)
+
+
+class ChatError(Exception):
+    """Base class for errors raised by ChatService; `status_code` is the HTTP status to return."""
+    status_code = 500
+
+
+class ChatUnavailableError(ChatError):
+    status_code = 503
+
+
+class ChatBusyError(ChatError):
+    status_code = 429
+
+
+class ChatTimeoutError(ChatError):
+    status_code = 504
+
+
+def build_huggingface_model():
+    """Build the Hugging Face chat model, or return None if it is not configured."""
+    # backend/.env has already been loaded by app.api
+    hf_token = os.getenv("HUGGINGFACEHUB_API_TOKEN")
+
+    if not hf_token:
+        logger.warning("Hugging Face API token not found. Chatbot functionality will be limited.")
+        return None
+
+    try:
+        from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
+        llm = HuggingFaceEndpoint(
+            repo_id="mistralai/Mistral-7B-Instruct-v0.2",
+            task="conversational",
+            max_new_tokens=512,
+            temperature=0.7,
+            repetition_penalty=1.1,
+            huggingfacehub_api_token=hf_token
+        )
+        chat_model = ChatHuggingFace(llm=llm)
+        logger.info("Hugging Face Chat Model initialized successfully.")
+        return chat_model
+    except Exception as e:
+        logger.error(f"Failed to initialize Hugging Face model: {e}")
+        return None
+
+
+def build_local_model(responses=None, sleep=None):
+    """
+    Offline stand-in for the Hugging Face model. It cycles through `responses`
+    and supports both invoke and stream, so the chat endpoints can be exercised
+    without network access or an API token.
+    """
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    return FakeListChatModel(responses=responses or [LOCAL_RESPONSE], sleep=sleep)
+
+
+MODEL_BACKENDS = {
+    'huggingface': build_huggingface_model,
+    'local': build_local_model
+}
+
+
+def default_model_factory():
+    """Pick the model backend from the CHAT_MODEL_BACKEND environment variable."""
+    backend = os.getenv('CHAT_MODEL_BACKEND', 'huggingface').lower()
+    if backend not in MODEL_BACKENDS:
+        logger.error(f"Unknown CHAT_MODEL_BACKEND '{backend}', expected one of {sorted(MODEL_BACKENDS)}")
+        return None
+    return MODEL_BACKENDS[backend]()
+
+
+def normalize_message(message):
+    """Cache key for a question: case, surrounding punctuation and repeated whitespace are ignored."""
+    return re.sub(r'\s+', ' ', message).strip().strip('?!.').strip().lower()
+
+
+class ChatService:
+    """
+    Runs the prompt | model | parser chain for the chat endpoint.
+
+    The chain is built once on first use and shared by every request. Model
+    calls run on a bounded thread pool: at most `max_pending` calls may be
+    queued or running, further requests fail fast with ChatBusyError instead
+    of holding a Flask worker, and callers stop waiting after `timeout`
+    seconds. Replies are kept in an LRU cache keyed by the normalized question.
+    """
+
+    def __init__(self, model_factory=default_model_factory, max_workers=4, max_pending=8,
+                 timeout=60.0, cache_size=256, cache_ttl=3600.0):
+        self.model_factory = model_factory
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+
+        self._chain = None
+        self._prompt = None
+        self._model = None
+        self._chain_loaded = False
+        self._chain_lock = threading.Lock()
+        self._executor = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def get_chain(self):
+        """Build the chain on first call; returns None if no model is available."""
+        if self._chain_loaded:
+            return self._chain
+
+        with self._chain_lock:
+            if self._chain_loaded:
+                return self._chain
+
+            chat_model = self.model_factory()
+            if chat_model is not None:
+                from langchain_core.prompts import PromptTemplate
+                from langchain_core.output_parsers import StrOutputParser
+                self._prompt = PromptTemplate.from_template(PROMPT_TEMPLATE)
+                self._model = chat_model
+                self._chain = self._prompt | chat_model | StrOutputParser()
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='chat')
+
+            self._chain_loaded = True
+            return self._chain
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            reply, stored_at = entry
+            if self.cache_ttl is not None and time.monotonic() - stored_at > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return reply
+
+    def _cache_put(self, key, reply):
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (reply, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _acquire_slot(self):
+        if not self._slots.acquire(blocking=False):
+            raise ChatBusyError('The chatbot is busy, please try again shortly.')
+
+    def ask(self, message):
+        """Return the reply to `message`, from the cache when the question was asked before."""
+        chain = self.get_chain()
+        if chain is None:
+            raise ChatUnavailableError('Chatbot is not available due to initialization error.')
+
+        key = normalize_message(message)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        self._acquire_slot()
+        try:
+            future = self._executor.submit(chain.invoke, {"user_input": message})
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the model call actually finishes, even if the
+        # caller has already given up, so abandoned calls still count against the limit.
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            reply = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ChatTimeoutError(f'The chatbot did not answer within {self.timeout:g} seconds.')
+
+        self._cache_put(key, reply)
+        return reply
+
+    def stream(self, message, max_buffered_tokens=64, idle_timeout=None):
+        """
+        Start streaming the reply to `message` and return a generator of text
+        chunks. Availability and capacity are checked before returning, so
+        ChatError is raised here rather than from the generator.
+
+        The model runs on the pool and hands chunks over through a bounded
+        queue: if the client reads slowly the producer blocks once
+        `max_buffered_tokens` chunks are waiting. Closing the generator (which
+        Werkzeug does when the client disconnects) stops the producer at the
+        next chunk and releases its slot. `idle_timeout` (default: the service
+        timeout) bounds the wait for each chunk.
+        """
+        chain = self.get_chain()
+        if chain is None:
+            raise ChatUnavailableError('Chatbot is not available due to initialization error.')
+
+        key = normalize_message(message)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return (chunk for chunk in [cached])
+
+        idle_timeout = self.timeout if idle_timeout is None else idle_timeout
+        chunks = queue.Queue(maxsize=max_buffered_tokens)
+        cancelled = threading.Event()
+        done = object()
+
+        def put(item):
+            # Block while the consumer is behind, but give up once it has gone away
+            while not cancelled.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            # Stream from the model directly rather than through the chain:
+            # closing a RunnableSequence stream drains the remaining output,
+            # closing the model's own stream stops generation straight away.
+            parts = []
+            model_stream = None
+            try:
+                model_stream = self._model.stream(self._prompt.invoke({"user_input": message}))
+                for message_chunk in model_stream:
+                    chunk = message_chunk.content
+                    if not chunk:
+                        continue
+                    if not put(chunk):
+                        break
+                    parts.append(chunk)
+                else:
+                    self._cache_put(key, ''.join(parts))
+                    put(done)
+            except Exception as e:
+                logger.error(f"Error while streaming chat reply: {e}")
+                put(e)
+            finally:
+                if model_stream is not None:
+                    model_stream.close()
+
+        self._acquire_slot()
+        try:
+            future = self._executor.submit(produce)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        def generate():
+            try:
+                while True:
+                    try:
+                        item = chunks.get(timeout=idle_timeout)
+                    except queue.Empty:
+                        raise ChatTimeoutError(f'The chatbot stopped responding for {idle_timeout:g} seconds.')
+                    if item is done:
+                        return
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+            finally:
+                cancelled.set()
+
+        return generate()
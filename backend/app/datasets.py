@@ -0,0 +1,231 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+
+import numpy as np
+
+from .eda_cache import dataset_fingerprint
+
+# Registry of uploaded datasets. An upload is validated once, split, scaled
+# and stored as .npy arrays under <root>/<dataset_id>/, where the ID is a hash
+# of the CSV bytes and the chosen columns. Later training runs and EDA
+# requests load the arrays directly instead of parsing and scaling again:
+#
+#     <root>/<dataset_id>/meta.json        columns, label mapping, scaler, counts
+#     <root>/<dataset_id>/features.npy     unscaled features of every row (for EDA)
+#     <root>/<dataset_id>/labels.npy       labels mapped to 0/1
+#     <root>/<dataset_id>/X_train.npy ...  scaled split used for training
+
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+MIN_ROWS = 10
+N_FEATURES = 2  # the network architecture is fixed at [2, 2, 1]
+ARRAYS = ('features', 'labels', 'X_train', 'X_test', 'y_train', 'y_test')
+
+_DATASET_ID = re.compile(r'^[0-9a-f]{16}$')
+
+
+class DatasetError(ValueError):
+    """Raised when an upload is not a usable dataset or its columns are invalid."""
+
+
+class DatasetNotFoundError(DatasetError):
+    """Raised for a dataset ID that is malformed or not in the registry."""
+
+
+def _read_csv(data):
+    import pandas as pd
+
+    if not data:
+        raise DatasetError('The uploaded file is empty')
+    if len(data) > MAX_UPLOAD_BYTES:
+        raise DatasetError(f'The uploaded file is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB')
+    try:
+        df = pd.read_csv(BytesIO(data))
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise DatasetError(f'Could not parse CSV: {e}')
+    if df.columns.duplicated().any():
+        raise DatasetError('Column names must be unique')
+    return df
+
+
+def inspect_csv(data):
+    """
+    Summarize the columns of an uploaded CSV so the user can choose features
+    and a label: numeric columns are feature candidates and columns with
+    exactly two distinct values are label candidates.
+    """
+    import pandas as pd
+
+    df = _read_csv(data)
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        columns.append({
+            'name': str(name),
+            'dtype': str(column.dtype),
+            'numeric': bool(pd.api.types.is_numeric_dtype(column)),
+            'missing': int(column.isna().sum()),
+            'unique': int(column.nunique())
+        })
+    return {
+        'rows': len(df),
+        'columns': columns,
+        'feature_candidates': [c['name'] for c in columns if c['numeric'] and c['unique'] > 1],
+        'label_candidates': [c['name'] for c in columns if c['unique'] == 2]
+    }
+
+
+def _validate_columns(df, feature_columns, label_column):
+    import pandas as pd
+
+    feature_columns = list(feature_columns or [])
+    if len(feature_columns) != N_FEATURES:
+        raise DatasetError(f'Choose exactly {N_FEATURES} feature columns')
+    if len(set(feature_columns)) != N_FEATURES:
+        raise DatasetError('Feature columns must be different')
+    if not label_column:
+        raise DatasetError('Choose a label column')
+    if label_column in feature_columns:
+        raise DatasetError('The label column cannot also be a feature')
+    missing = [name for name in feature_columns + [label_column] if name not in df.columns]
+    if missing:
+        raise DatasetError(f'Unknown columns: {", ".join(missing)}')
+
+    for name in feature_columns:
+        if not pd.api.types.is_numeric_dtype(df[name]):
+            raise DatasetError(f'Feature column {name!r} is not numeric')
+    selected = df[feature_columns + [label_column]]
+    incomplete = int(selected.isna().any(axis=1).sum())
+    if incomplete:
+        raise DatasetError(f'{incomplete} rows have missing values in the selected columns')
+    if not np.isfinite(selected[feature_columns].to_numpy(dtype=float)).all():
+        raise DatasetError('Feature columns contain infinite values')
+
+    label_values = sorted(df[label_column].unique().tolist())
+    if len(label_values) != 2:
+        raise DatasetError(f'The label column must have exactly 2 distinct values, found {len(label_values)}')
+    if len(df) < MIN_ROWS:
+        raise DatasetError(f'The dataset needs at least {MIN_ROWS} rows')
+    return feature_columns, label_values
+
+
+class DatasetRegistry:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _path(self, dataset_id, *parts):
+        if not isinstance(dataset_id, str) or not _DATASET_ID.match(dataset_id):
+            raise DatasetNotFoundError(f'Invalid dataset ID: {dataset_id!r}')
+        return os.path.join(self.root, dataset_id, *parts)
+
+    def register(self, data, feature_columns, label_column, name=None, test_size=0.2, random_state=42):
+        """
+        Validate the CSV bytes in `data`, split and scale the selected columns
+        and store the arrays. Returns the dataset metadata; uploading the same
+        file with the same columns again returns the existing entry.
+        """
+        config = {
+            'feature_columns': list(feature_columns or []),
+            'label_column': label_column,
+            'test_size': test_size,
+            'random_state': random_state
+        }
+        digest = hashlib.sha256(data)
+        digest.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+        dataset_id = digest.hexdigest()[:16]
+        if os.path.exists(self._path(dataset_id, 'meta.json')):
+            return self.get(dataset_id)
+
+        import pandas as pd
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+
+        df = _read_csv(data)
+        feature_columns, label_values = _validate_columns(df, feature_columns, label_column)
+
+        features = df[feature_columns].to_numpy(dtype=float)
+        # Labels are stored as 0/1 in sorted order of the original values
+        labels = (df[label_column] == label_values[1]).to_numpy().astype(np.int64)
+        try:
+            X_train, X_test, y_train, y_test = train_test_split(
+                features, labels, test_size=test_size, random_state=random_state, stratify=labels)
+        except ValueError as e:
+            raise DatasetError(f'Cannot split the dataset: {e}')
+
+        # Fitted on the training rows only, as in cross-validation
+        scaler = StandardScaler().fit(X_train)
+        arrays = {
+            'features': features,
+            'labels': labels,
+            'X_train': scaler.transform(X_train),
+            'X_test': scaler.transform(X_test),
+            'y_train': y_train,
+            'y_test': y_test
+        }
+        frame = pd.DataFrame(features, columns=feature_columns)
+        frame[label_column] = labels
+
+        meta = {
+            'dataset_id': dataset_id,
+            'name': name or dataset_id,
+            'feature_columns': feature_columns,
+            'label_column': label_column,
+            'label_values': [str(value) for value in label_values],
+            'rows': int(len(labels)),
+            'train_rows': int(len(y_train)),
+            'test_rows': int(len(y_test)),
+            'positive_rate': float(labels.mean()),
+            'test_size': test_size,
+            'random_state': random_state,
+            'scaler': {'mean': scaler.mean_.tolist(), 'scale': scaler.scale_.tolist()},
+            'fingerprint': dataset_fingerprint(frame),
+            'content_sha256': hashlib.sha256(data).hexdigest()
+        }
+
+        # Write into a temporary directory and rename it into place, so a
+        # crash never leaves a half-written dataset behind
+        os.makedirs(self.root, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.upload-', dir=self.root)
+        try:
+            for key, value in arrays.items():
+                np.save(os.path.join(staging, f'{key}.npy'), value)
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+            with self._lock:
+                if os.path.exists(self._path(dataset_id)):
+                    return self.get(dataset_id)  # registered concurrently
+                os.replace(staging, self._path(dataset_id))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return meta
+
+    def get(self, dataset_id):
+        try:
+            with open(self._path(dataset_id, 'meta.json'), 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise DatasetNotFoundError(f'Dataset {dataset_id} not found')
+
+    def load(self, dataset_id):
+        """Return (meta, arrays) with every stored array loaded."""
+        meta = self.get(dataset_id)
+        arrays = {key: np.load(self._path(dataset_id, f'{key}.npy')) for key in ARRAYS}
+        return meta, arrays
+
+    def list(self):
+        if not os.path.isdir(self.root):
+            return []
+        datasets = []
+        for entry in sorted(os.listdir(self.root)):
+            if _DATASET_ID.match(entry):
+                try:
+                    datasets.append(self.get(entry))
+                except (DatasetNotFoundError, ValueError):
+                    continue
+        return datasets
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import threading
+
+# Bump when the stats or plots produced for a dataset change, so entries
+# written by an older version are not served from disk
+CACHE_VERSION = 2
+
+
+def dataset_fingerprint(df):
+    """
+    Content hash of a dataframe: column names, dtypes and every row value.
+    Two dataframes with the same fingerprint produce the same EDA output.
+    """
+    import pandas as pd
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class EDACache:
+    """
+    EDA statistics and plots keyed by dataset fingerprint. Entries are kept
+    in memory and, when cache_dir is set, mirrored to
+    eda_v<CACHE_VERSION>_<fingerprint>.json so a restarted process does not
+    have to render the plots again.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _path(self, fingerprint):
+        return os.path.join(self.cache_dir, f'eda_v{CACHE_VERSION}_{fingerprint}.json')
+
+    def get(self, fingerprint):
+        """
+        Return the cached {'stats': ..., 'plots': {...}} entry or None. The
+        entry may hold only some of the plots if a previous render failed.
+        """
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+        if entry is not None or not self.cache_dir:
+            return entry
+
+        path = self._path(fingerprint)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._entries[fingerprint] = entry
+        return entry
+
+    def put(self, fingerprint, entry):
+        with self._lock:
+            self._entries[fingerprint] = entry
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial entry
+            tmp_path = self._path(fingerprint) + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(fingerprint))
+
+    def invalidate(self, keep=None):
+        """Drop in-memory entries for every fingerprint except `keep`."""
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if k == keep}
@@ -0,0 +1,114 @@
+import numpy as np
+
+# Threshold-independent evaluation from a single set of probabilities. Scores
+# are sorted once; cumulative true/false positive counts at every distinct
+# score then give the confusion matrix for every possible threshold, from
+# which ROC and PR curves, AUC and the best-F1 threshold follow directly.
+# Predictions use `probability >= threshold` throughout.
+
+MAX_BINS = 100
+
+
+def _safe_divide(numerator, denominator):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _cumulative_counts(y_true, y_score):
+    """
+    Sort by descending score and return (thresholds, tps, fps) where tps[i] and
+    fps[i] count the samples with score >= thresholds[i].
+    """
+    order = np.argsort(-y_score, kind='mergesort')
+    scores = y_score[order]
+    labels = y_true[order]
+
+    # Last index of each run of equal scores
+    last = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tps = np.cumsum(labels)[last]
+    fps = (last + 1) - tps
+    return scores[last], tps, fps
+
+
+def confusion_at(y_true, y_score, threshold):
+    """Confusion matrix counts for `y_score >= threshold`."""
+    predicted = y_score >= threshold
+    actual = y_true == 1
+    return {
+        'true_positives': int(np.count_nonzero(predicted & actual)),
+        'true_negatives': int(np.count_nonzero(~predicted & ~actual)),
+        'false_positives': int(np.count_nonzero(predicted & ~actual)),
+        'false_negatives': int(np.count_nonzero(~predicted & actual))
+    }
+
+
+def threshold_sweep(y_true, y_score, n_bins=10):
+    """
+    ROC curve, precision-recall curve, ROC AUC, average precision, the
+    threshold with the best F1 score and calibration bins for binary labels
+    `y_true` and positive-class probabilities `y_score`.
+    """
+    y_true = np.asarray(y_true).astype(int).ravel()
+    y_score = np.asarray(y_score, dtype=float).ravel()
+    if y_true.size == 0:
+        raise ValueError('Cannot evaluate an empty set')
+    if not 1 <= n_bins <= MAX_BINS:
+        raise ValueError(f'n_bins must be between 1 and {MAX_BINS}')
+
+    thresholds, tps, fps = _cumulative_counts(y_true, y_score)
+    positives = int(y_true.sum())
+    negatives = int(y_true.size - positives)
+
+    tpr = _safe_divide(tps, positives)
+    fpr = _safe_divide(fps, negatives)
+    precision = _safe_divide(tps, tps + fps)
+    f1 = _safe_divide(2 * precision * tpr, precision + tpr)
+
+    # The ROC curve starts at (0, 0): a threshold above every score, sent as null
+    roc_fpr = np.r_[0.0, fpr]
+    roc_tpr = np.r_[0.0, tpr]
+    roc_auc = float(np.sum(np.diff(roc_fpr) * (roc_tpr[1:] + roc_tpr[:-1]) / 2))
+    average_precision = float(np.sum(np.diff(np.r_[0.0, tpr]) * precision))
+
+    best = int(np.argmax(f1))
+
+    # Calibration: mean predicted probability vs observed positive rate per bin
+    bins = np.minimum((y_score * n_bins).astype(int), n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    predicted_sum = np.bincount(bins, weights=y_score, minlength=n_bins)
+    positive_sum = np.bincount(bins, weights=y_true, minlength=n_bins)
+    mean_predicted = _safe_divide(predicted_sum, counts)
+    fraction_positive = _safe_divide(positive_sum, counts)
+    calibration_error = float(np.sum(counts * np.abs(mean_predicted - fraction_positive)) / y_true.size)
+
+    return {
+        'positives': positives,
+        'negatives': negatives,
+        'roc': {
+            'thresholds': [None] + thresholds.tolist(),
+            'fpr': roc_fpr.tolist(),
+            'tpr': roc_tpr.tolist(),
+            'auc': roc_auc
+        },
+        'pr': {
+            'thresholds': thresholds.tolist(),
+            'precision': precision.tolist(),
+            'recall': tpr.tolist(),
+            'average_precision': average_precision
+        },
+        'best_f1': {
+            'threshold': float(thresholds[best]),
+            'f1_score': float(f1[best]),
+            'precision': float(precision[best]),
+            'recall': float(tpr[best])
+        },
+        'calibration': {
+            'bin_edges': np.linspace(0, 1, n_bins + 1).tolist(),
+            'count': counts.tolist(),
+            'mean_predicted': mean_predicted.tolist(),
+            'fraction_positive': fraction_positive.tolist(),
+            'expected_calibration_error': calibration_error,
+            'brier_score': float(np.mean((y_score - y_true) ** 2))
+        }
+    }
@@ -0,0 +1,176 @@
+import numpy as np
+
+# Training loss over a 2D slice of parameter space: theta = theta0 + a*d1 + b*d2.
+# All grid points are evaluated at once. Parameters are stacked into
+# (points, ...) tensors and the forward and backward passes broadcast over
+# points and samples together, so a 41x41 slice costs one batched computation
+# instead of ~1700 * n_samples calls to L_layer_forward. Points are processed
+# in chunks to keep the (points, hidden, samples) intermediates bounded.
+
+PARAMETER_KEYS = ('W1', 'b1', 'W2', 'b2')
+MAX_RESOLUTION = 101
+CHUNK_ELEMENTS = 2_000_000  # points * samples per chunk (~16 MB per float64 intermediate)
+
+
+def parameter_names(parameters):
+    """Flat names such as 'W1[0,1]', in the order used by flatten()."""
+    names = []
+    for key in PARAMETER_KEYS:
+        for index in np.ndindex(*parameters[key].shape):
+            names.append(f'{key}[{",".join(str(i) for i in index)}]')
+    return names
+
+
+def flatten(parameters):
+    return np.concatenate([np.asarray(parameters[key], dtype=float).ravel() for key in PARAMETER_KEYS])
+
+
+def _split(thetas, parameters):
+    """(points, n_params) -> dict of (points, *shape) tensors."""
+    tensors = {}
+    offset = 0
+    for key in PARAMETER_KEYS:
+        shape = parameters[key].shape
+        size = int(np.prod(shape))
+        tensors[key] = thetas[:, offset:offset + size].reshape((-1,) + shape)
+        offset += size
+    return tensors
+
+
+def weight_directions(parameters, first, second):
+    """Unit directions along two named parameters, e.g. 'W1[0,0]' and 'W2[1,0]'."""
+    names = parameter_names(parameters)
+    for name in (first, second):
+        if name not in names:
+            raise ValueError(f'Unknown parameter {name!r}; expected one of {", ".join(names)}')
+    if first == second:
+        raise ValueError('The two axes must be different parameters')
+    directions = np.zeros((2, len(names)))
+    directions[0, names.index(first)] = 1.0
+    directions[1, names.index(second)] = 1.0
+    return directions
+
+
+def random_directions(parameters, seed=0):
+    """
+    Two Gaussian directions, each rescaled per parameter tensor to that
+    tensor's norm (filter normalization) so the axes are comparable in scale
+    to the weights themselves. Zero tensors, e.g. freshly initialized biases,
+    get unit-norm directions instead.
+    """
+    rng = np.random.default_rng(seed)
+    directions = []
+    for _ in range(2):
+        parts = []
+        for key in PARAMETER_KEYS:
+            value = np.asarray(parameters[key], dtype=float)
+            direction = rng.standard_normal(value.shape)
+            norm = np.linalg.norm(value)
+            direction *= (norm if norm > 0 else 1.0) / np.linalg.norm(direction)
+            parts.append(direction.ravel())
+        directions.append(np.concatenate(parts))
+    return np.array(directions)
+
+
+def batched_loss_and_gradient(thetas, parameters, X, y):
+    """
+    Mean binary cross-entropy and its gradient for every row of `thetas`.
+    X: (2, n_samples), y: (n_samples,). Returns loss (points,) and gradient
+    (points, n_params), with the gradient flattened in flatten() order.
+    """
+    m = X.shape[1]
+    chunk = max(1, CHUNK_ELEMENTS // max(m, 1))
+    losses = np.empty(len(thetas))
+    gradients = np.empty_like(thetas)
+
+    for start in range(0, len(thetas), chunk):
+        p = _split(thetas[start:start + chunk], parameters)
+
+        # Forward, as in L_layer_forward but with a leading points axis
+        Z1 = np.einsum('gij,im->gjm', p['W1'], X) + p['b1']       # (g, 2, m)
+        A2 = 1 / (1 + np.exp(-Z1))
+        Z2 = np.einsum('gj,gjm->gm', p['W2'][:, :, 0], A2) + p['b2'][:, 0]  # (g, m)
+
+        # log(1 + e^z) - y*z is the cross-entropy of sigmoid(z), without overflow
+        losses[start:start + chunk] = np.mean(np.logaddexp(0, Z2) - y * Z2, axis=1)
+
+        # Backward
+        dZ2 = (1 / (1 + np.exp(-Z2)) - y) / m                     # (g, m)
+        dW2 = np.einsum('gm,gjm->gj', dZ2, A2)[:, :, None]
+        db2 = dZ2.sum(axis=1)[:, None, None]
+        dZ1 = p['W2'] * dZ2[:, None, :] * A2 * (1 - A2)            # (g, 2, m)
+        dW1 = np.einsum('im,gjm->gij', X, dZ1)
+        db1 = dZ1.sum(axis=2)[:, :, None]
+
+        gradients[start:start + chunk] = np.concatenate(
+            [g.reshape(len(g), -1) for g in (dW1, db1, dW2, db2)], axis=1
+        )
+
+    return losses, gradients
+
+
+def project_trajectory(weights_history, biases_history, origin, directions):
+    """Coordinates (a, b) of each recorded epoch in the slice's plane."""
+    if not weights_history:
+        return []
+    thetas = np.array([
+        flatten({**weights, **biases}) for weights, biases in zip(weights_history, biases_history)
+    ])
+    # Least squares, since the path generally leaves the plane
+    coordinates, *_ = np.linalg.lstsq(directions.T, (thetas - origin).T, rcond=None)
+    return coordinates.T.tolist()
+
+
+def compute_landscape(parameters, X, y, mode='random', axes=None, span=1.0, resolution=41, seed=0):
+    """
+    Loss and gradient field over a resolution x resolution grid spanning
+    [-span, span] along two directions around `parameters`. mode='weights'
+    moves the two parameters named in `axes`; mode='random' uses two
+    filter-normalized random directions drawn with `seed`.
+    """
+    if not 2 <= resolution <= MAX_RESOLUTION:
+        raise ValueError(f'resolution must be between 2 and {MAX_RESOLUTION}')
+    if not np.isfinite(span) or span <= 0:
+        raise ValueError('span must be a positive finite number')
+
+    if mode == 'weights':
+        if not axes or len(axes) != 2:
+            raise ValueError("mode 'weights' needs two parameter names in axes")
+        directions = weight_directions(parameters, *axes)
+    elif mode == 'random':
+        directions = random_directions(parameters, seed)
+    else:
+        raise ValueError("mode must be 'weights' or 'random'")
+
+    origin = flatten(parameters)
+    offsets = np.linspace(-span, span, resolution)
+    alpha, beta = np.meshgrid(offsets, offsets)  # rows vary beta, columns alpha
+    thetas = origin + alpha.reshape(-1, 1) * directions[0] + beta.reshape(-1, 1) * directions[1]
+
+    losses, gradients = batched_loss_and_gradient(thetas, parameters, X, np.asarray(y, dtype=float))
+    # Directional derivatives dL/da and dL/db, i.e. the gradient within the plane
+    in_plane = gradients @ directions.T
+
+    shape = (resolution, resolution)
+    center_loss, _ = batched_loss_and_gradient(origin[None, :], parameters, X, np.asarray(y, dtype=float))
+    landscape = {
+        'mode': mode,
+        'resolution': resolution,
+        'span': span,
+        'offsets': offsets.tolist(),
+        'loss': losses.reshape(shape).tolist(),
+        'gradient': {
+            'alpha': in_plane[:, 0].reshape(shape).tolist(),
+            'beta': in_plane[:, 1].reshape(shape).tolist()
+        },
+        'center_loss': float(center_loss[0]),
+        'loss_range': [float(losses.min()), float(losses.max())]
+    }
+    if mode == 'weights':
+        names = parameter_names(parameters)
+        landscape['axes'] = [
+            {'name': name, 'values': (origin[names.index(name)] + offsets).tolist()} for name in axes
+        ]
+    else:
+        landscape['seed'] = seed
+    return landscape, origin, directions
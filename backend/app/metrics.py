@@ -0,0 +1,140 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Minimal in-process metrics with Prometheus text exposition, so the backend
+# needs no extra dependency. Everything is module-level and thread-safe:
+#
+#     with metrics.span('session_write'):
+#         ...
+#     metrics.REQUESTS.inc(method='GET', endpoint='eda', status='200')
+#     metrics.render()  # body for GET /api/metrics
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    return 'Inf' if value == float('inf') else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+                    cumulative += count
+                    le = (('le', '+Inf' if bound == float('inf') else repr(bound)),)
+                    lines.append(f'{self.name}_bucket{_format_labels(key, le)} {cumulative}')
+                lines.append(f'{self.name}_sum{_format_labels(key)} {_format_value(series["sum"])}')
+                lines.append(f'{self.name}_count{_format_labels(key)} {series["count"]}')
+        return lines
+
+
+def _register(metric):
+    with _registry_lock:
+        _registry.append(metric)
+
+
+def render():
+    """Prometheus text exposition format (version 0.0.4) for every metric."""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+SPAN_SECONDS = Histogram(
+    'nnv_span_duration_seconds', 'Time spent in instrumented backend operations.')
+SPAN_ERRORS = Counter(
+    'nnv_span_errors_total', 'Instrumented operations that raised an exception.')
+REQUEST_SECONDS = Histogram(
+    'nnv_http_request_duration_seconds', 'Flask request latency by endpoint, up to the end of the response body.')
+REQUESTS = Counter(
+    'nnv_http_requests_total', 'Flask requests by endpoint and status code.')
+EPOCHS = Counter(
+    'nnv_training_epochs_total', 'Training epochs completed.')
+SAMPLES = Counter(
+    'nnv_training_samples_total', 'Per-sample forward/update steps executed during training.')
+
+
+@contextmanager
+def span(name, **labels):
+    """Time the enclosed block into nnv_span_duration_seconds{span=name}."""
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        SPAN_ERRORS.inc(span=name, **labels)
+        raise
+    finally:
+        SPAN_SECONDS.observe(time.perf_counter() - started, span=name, **labels)
+
+
+def observe(name, seconds, **labels):
+    """Record a duration measured elsewhere, e.g. time accumulated over a loop."""
+    SPAN_SECONDS.observe(seconds, span=name, **labels)
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import struct
+import numpy as np
+
+# Binary model file layout:
+#   MAGIC (8 bytes) | header length (uint32, little endian) | JSON header | raw array data
+# The header records the format version, the architecture, the dtype, the
+# shape and byte offset of every array and a SHA-256 over the rest of the
+# header and the raw data block.
+MAGIC = b'NNVMODEL'
+FORMAT_VERSION = 1
+DTYPE = '<f8'
+BINARY_EXTENSION = '.nnv'
+
+_HEADER_LENGTH = struct.Struct('<I')
+
+
+class ModelFormatError(ValueError):
+    """Raised when a model file is truncated, corrupt or of an unknown version."""
+
+
+def _checksum(header, payload):
+    """SHA-256 of every header field except the checksum itself, then the payload."""
+    digest = hashlib.sha256()
+    fields = {key: value for key, value in header.items() if key != 'sha256'}
+    digest.update(json.dumps(fields, sort_keys=True).encode('utf-8'))
+    digest.update(payload)
+    return digest.hexdigest()
+
+
+def validate_model(layer_dimensions, parameters, scaler_mean, scaler_scale):
+    """
+    Check that the parameters and scaler statistics fit layer_dimensions:
+    W<l> is (n[l-1], n[l]) and b<l> is (n[l], 1) for every layer, nothing
+    else is present, and every value is finite. Raises ModelFormatError.
+    """
+    if (not isinstance(layer_dimensions, (list, tuple)) or len(layer_dimensions) < 2
+            or not all(isinstance(n, int) and not isinstance(n, bool) and n > 0 for n in layer_dimensions)):
+        raise ModelFormatError(f'Invalid layer dimensions: {layer_dimensions!r}')
+
+    expected = {}
+    for layer in range(1, len(layer_dimensions)):
+        expected[f'W{layer}'] = (layer_dimensions[layer - 1], layer_dimensions[layer])
+        expected[f'b{layer}'] = (layer_dimensions[layer], 1)
+    missing = sorted(set(expected) - set(parameters))
+    unexpected = sorted(set(parameters) - set(expected))
+    if missing:
+        raise ModelFormatError(f'Model is missing parameters: {", ".join(missing)}')
+    if unexpected:
+        raise ModelFormatError(f'Model has unexpected parameters: {", ".join(unexpected)}')
+
+    arrays = dict(parameters)
+    arrays['scaler mean'] = scaler_mean
+    arrays['scaler scale'] = scaler_scale
+    expected['scaler mean'] = expected['scaler scale'] = (layer_dimensions[0],)
+    for name, shape in expected.items():
+        value = arrays[name]
+        if value.shape != shape:
+            raise ModelFormatError(f'{name} has shape {list(value.shape)}, expected {list(shape)}')
+        if not np.isfinite(value).all():
+            raise ModelFormatError(f'{name} contains non-finite values')
+    if not (scaler_scale > 0).all():
+        raise ModelFormatError('scaler scale must be positive')
+
+
+def write_model(filepath, parameters, layer_dimensions, scaler_mean, scaler_scale):
+    """
+    Write parameters and scaler statistics as one contiguous little-endian
+    float64 block behind a small JSON header.
+    """
+    arrays = {f'parameters/{key}': value for key, value in parameters.items()}
+    arrays['scaler/mean'] = scaler_mean
+    arrays['scaler/scale'] = scaler_scale
+
+    entries = {}
+    chunks = []
+    offset = 0
+    for name, value in arrays.items():
+        data = np.ascontiguousarray(value, dtype=DTYPE)
+        entries[name] = {'shape': list(data.shape), 'offset': offset}
+        chunks.append(data.tobytes())
+        offset += data.nbytes
+    payload = b''.join(chunks)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'layer_dimensions': [int(n) for n in layer_dimensions],
+        'dtype': DTYPE,
+        'arrays': entries,
+        'payload_bytes': len(payload)
+    }
+    header['sha256'] = _checksum(header, payload)
+    header = json.dumps(header).encode('utf-8')
+
+    with open(filepath, 'wb') as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        f.write(payload)
+
+    return filepath
+
+
+def is_binary_model(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _read_array(payload, dtype, name, entry):
+    try:
+        shape = [int(n) for n in entry['shape']]
+        offset = int(entry['offset'])
+    except (KeyError, TypeError, ValueError):
+        raise ModelFormatError(f'Invalid entry for "{name}"')
+    if offset < 0 or any(n < 0 for n in shape):
+        raise ModelFormatError(f'Invalid entry for "{name}"')
+    count = int(np.prod(shape, dtype=np.int64))
+    if offset + count * dtype.itemsize > len(payload):
+        raise ModelFormatError(f'"{name}" lies outside the data block')
+    return np.frombuffer(payload, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def read_model(filepath, verify=True):
+    """
+    Read a binary model file. The arrays returned are writable views into a
+    single buffer read from disk, so no per-array copies are made. Any file
+    that is corrupt or does not match its own layer_dimensions raises
+    ModelFormatError.
+    """
+    with open(filepath, 'rb') as f:
+        buffer = bytearray(f.read())
+
+    prefix = len(MAGIC) + _HEADER_LENGTH.size
+    if len(buffer) < prefix or bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ModelFormatError('Not a model file')
+
+    (header_length,) = _HEADER_LENGTH.unpack_from(buffer, len(MAGIC))
+    try:
+        header = json.loads(bytes(buffer[prefix:prefix + header_length]).decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise ModelFormatError('Model header is corrupt')
+    if not isinstance(header, dict):
+        raise ModelFormatError('Model header is corrupt')
+
+    if header.get('format_version') != FORMAT_VERSION:
+        raise ModelFormatError(f"Unsupported model format version: {header.get('format_version')}")
+    for key in ('layer_dimensions', 'dtype', 'arrays', 'payload_bytes', 'sha256'):
+        if key not in header:
+            raise ModelFormatError(f'Model header is missing "{key}"')
+    if not isinstance(header['arrays'], dict):
+        raise ModelFormatError('Model header is corrupt')
+    for key in ('scaler/mean', 'scaler/scale'):
+        if key not in header['arrays']:
+            raise ModelFormatError(f'Model file is missing "{key}"')
+
+    payload = memoryview(buffer)[prefix + header_length:]
+    if len(payload) != header['payload_bytes']:
+        raise ModelFormatError('Model file is truncated')
+    if verify and _checksum(header, payload) != header['sha256']:
+        raise ModelFormatError('Model checksum mismatch')
+
+    if header['dtype'] != DTYPE:
+        raise ModelFormatError(f"Unsupported dtype: {header['dtype']}")
+    dtype = np.dtype(DTYPE)
+    arrays = {name: _read_array(payload, dtype, name, entry) for name, entry in header['arrays'].items()}
+
+    model = {
+        'format_version': header['format_version'],
+        'layer_dimensions': header['layer_dimensions'],
+        'parameters': {
+            name.split('/', 1)[1]: value
+            for name, value in arrays.items() if name.startswith('parameters/')
+        },
+        'scaler': {
+            'mean': arrays['scaler/mean'],
+            'scale': arrays['scaler/scale']
+        }
+    }
+    validate_model(model['layer_dimensions'], model['parameters'],
+                   model['scaler']['mean'], model['scaler']['scale'])
+    return model
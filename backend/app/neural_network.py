@@ -1,19 +1,164 @@
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import seaborn as sns
 import json
+import logging
 import os
+import time
+import multiprocessing
 from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import base64
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
-from scipy.ndimage import gaussian_filter
+import hashlib
+import threading
+from collections import OrderedDict
+
+from . import model_format
+from . import boundary_grid
+from . import metrics
+from . import evaluation
+from . import loss_landscape
+from .eda_cache import EDACache, dataset_fingerprint
+
+# pandas, matplotlib, seaborn, scikit-learn and scipy are imported inside the
+# functions that use them so that importing this module (and app.api) stays
+# cheap. Call warm_up() to pay the import cost ahead of the first request.
+
+logger = logging.getLogger(__name__)
+
+
+def _pyplot():
+    import matplotlib
+    matplotlib.use('Agg')  # Use non-interactive backend
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _seaborn():
+    _pyplot()
+    import seaborn as sns
+    return sns
+
+
+def warm_up():
+    """Import every heavy dependency used by NeuralNetwork."""
+    _seaborn()
+    import pandas  # noqa: F401
+    import sklearn.preprocessing  # noqa: F401
+    import sklearn.model_selection  # noqa: F401
+    import scipy.ndimage  # noqa: F401
+
+
+def _figure_to_base64(fig):
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+
+# Axis labels and histogram bins for the bundled placement dataset; other
+# datasets use their column names and automatic binning
+FEATURE_LABELS = {'cgpa': 'CGPA', 'iq': 'IQ Score'}
+HISTOGRAM_BINS = {'cgpa': 10, 'iq': 15}
+
+
+def _render_histogram(df, column):
+    sns = _seaborn()
+    label = FEATURE_LABELS.get(column, column)
+    # Explicit colours, as the training thread may be drawing a dark figure
+    fig = _pyplot().Figure(figsize=(10, 6), facecolor='white')
+    ax = fig.subplots()
+    ax.set_facecolor('white')
+    sns.histplot(df[column], bins=HISTOGRAM_BINS.get(column, 'auto'), kde=True, ax=ax)
+    ax.set_title(f'{label} Distribution')
+    ax.set_xlabel(label)
+    ax.set_ylabel('Frequency')
+    return _figure_to_base64(fig)
+
+
+def _render_scatter_plot(df, features, label):
+    sns = _seaborn()
+    x_label, y_label = (FEATURE_LABELS.get(column, column) for column in features)
+    fig = _pyplot().Figure(figsize=(10, 6), facecolor='white')
+    ax = fig.subplots()
+    ax.set_facecolor('white')
+    sns.scatterplot(x=features[0], y=features[1], hue=label, data=df, palette=['red', 'green'], ax=ax)
+    ax.set_title(f'{label.capitalize()} based on {x_label} and {y_label}')
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    return _figure_to_base64(fig)
+
+
+def eda_plots(features, label):
+    """Plot name -> renderer(df): a histogram per feature plus a scatter plot."""
+    plots = {f'{column}_hist': (lambda df, column=column: _render_histogram(df, column)) for column in features}
+    plots['scatter_plot'] = lambda df: _render_scatter_plot(df, features, label)
+    return plots
+
+
+DEFAULT_FEATURE_COLUMNS = ['cgpa', 'iq']
+DEFAULT_LABEL_COLUMN = 'placement'
+DEFAULT_CLASS_LABELS = ['NOT PLACED ❌', 'PLACED ✅']
+
+CV_METRICS = ('accuracy', 'precision', 'recall', 'f1_score')
+
+
+def _train_and_evaluate_fold(fold, X, y, train_idx, test_idx, learning_rate, epochs):
+    """
+    Train and evaluate one cross-validation fold in a worker process. The
+    scaler is fitted on the fold's training rows only, so no statistics leak
+    from the held-out rows.
+    """
+    from sklearn.preprocessing import StandardScaler
+    
+    nn = NeuralNetwork()
+    nn.scaler = StandardScaler()
+    nn.X_train = nn.scaler.fit_transform(X[train_idx])
+    nn.X_test = nn.scaler.transform(X[test_idx])
+    nn.y_train = y[train_idx]
+    nn.y_test = y[test_idx]
+    
+    nn.initialize_parameters()
+    history = nn.train(learning_rate=learning_rate, epochs=epochs, boundary_format=None)
+    
+    results = nn.evaluate()
+    results['fold'] = fold
+    results['train_samples'] = int(len(train_idx))
+    results['test_samples'] = int(len(test_idx))
+    results['final_loss'] = history['loss'][-1] if history['loss'] else None
+    results['final_train_accuracy'] = history['accuracy'][-1] if history['accuracy'] else None
+    return results
+
+
+ARCHITECTURE = [2, 2, 1]
+DEFAULT_THRESHOLD = 0.5
+LANDSCAPE_CACHE_SIZE = 16
+
+
+def read_bundled_dataset(filepath=None):
+    """The bundled placement CSV (or `filepath`) as a DataFrame."""
+    import pandas as pd
+    
+    # If filepath is not provided, use the local directory
+    if filepath is None:
+        # Get the current file's directory (which is backend/app)
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        # Look for the dataset in the same directory
+        filepath = os.path.join(current_dir, 'placement-dataset.csv')
+    
+    # Log the path being used
+    logger.info(f"Loading data from: {filepath}")
+    return pd.read_csv(filepath)
+
+
+def dataset_frame(meta, arrays):
+    """DataFrame of unscaled features and 0/1 labels for a registry dataset."""
+    import pandas as pd
+    
+    df = pd.DataFrame(arrays['features'], columns=meta['feature_columns'])
+    df[meta['label_column']] = arrays['labels']
+    return df
+
 
 class NeuralNetwork:
-    def __init__(self):
+    def __init__(self, eda_cache_dir=None):
         self.parameters = None
         self.scaler = None
         self.X_train = None
@@ -21,7 +166,9 @@ class NeuralNetwork:
         self.y_train = None
         self.y_test = None
         # Fixed architecture: 2 input, 2 hidden, 1 output as per original implementation
-        self.layer_dimensions = [2, 2, 1]
+        self.layer_dimensions = list(ARCHITECTURE)
+        # Probability at or above which predict/predict_single return class 1
+        self.threshold = DEFAULT_THRESHOLD
         self.training_history = {
             'loss': [],
             'accuracy': [],
@@ -29,96 +176,158 @@ class NeuralNetwork:
             'biases': [],
             'decision_boundaries': []
         }
+        self._last_boundary_grid = None
+        self.boundary_points = None
+        self._df = None
+        self.dataset_fingerprint = None
+        # Columns of the loaded dataset; dataset_id is None for the bundled CSV
+        self.dataset_id = None
+        self.feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+        self.label_column = DEFAULT_LABEL_COLUMN
+        self.class_labels = list(DEFAULT_CLASS_LABELS)
+        self.eda_cache = EDACache(eda_cache_dir)
+        self._landscape_cache = OrderedDict()
+        self._landscape_lock = threading.Lock()
         
     def load_and_preprocess_data(self, filepath=None):
-        # If filepath is not provided, use the local directory
-        if filepath is None:
-            # Get the current file's directory (which is backend/app)
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            # Look for the dataset in the same directory
-            filepath = os.path.join(current_dir, 'placement-dataset.csv')
-            
-        # Log the path being used
-        print(f"Loading data from: {filepath}")
-            
-        # Load the dataset
-        df = pd.read_csv(filepath)
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.model_selection import train_test_split
+        
+        with metrics.span('load_data'):
+            # Load the dataset
+            df = read_bundled_dataset(filepath)
+            model_scaler = self._restored_model_scaler()
+        
+            self._set_dataset(df, dataset_fingerprint(df), None, DEFAULT_FEATURE_COLUMNS,
+                              DEFAULT_LABEL_COLUMN, DEFAULT_CLASS_LABELS)
         
-        # Preprocess data
-        X = df[['cgpa', 'iq']].values
-        y = df['placement'].values
+            # Preprocess data
+            X = df[self.feature_columns].values
+            y = df[self.label_column].values
 
-        # Scale the features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+            # Scale the features
+            self.scaler = StandardScaler()
+            X_scaled = self.scaler.fit_transform(X)
 
-        # Split into training and testing sets
-        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
-            X_scaled, y, test_size=0.2, random_state=42)
+            # Split into training and testing sets
+            self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(
+                X_scaled, y, test_size=0.2, random_state=42)
+            if model_scaler is not None:
+                self._use_scaler(model_scaler)
+        
+        return df
+    
+    def _restored_model_scaler(self):
+        """
+        The scaler of a model restored with load_model before any data was
+        loaded, or None. Loading data must not replace it, since predictions
+        are served with the scaler the model was trained with.
+        """
+        if self._df is None and self.parameters is not None:
+            return self.scaler
+        return None
+    
+    def _use_scaler(self, scaler):
+        """Make `scaler` the serving scaler and rescale the loaded split to match."""
+        if self.X_train is not None and self.scaler is not None and scaler is not self.scaler:
+            self.X_train = scaler.transform(self.scaler.inverse_transform(self.X_train))
+            self.X_test = scaler.transform(self.scaler.inverse_transform(self.X_test))
+        self.scaler = scaler
+    
+    def _set_dataset(self, df, fingerprint, dataset_id, feature_columns, label_column, class_labels):
+        # A different dataset makes every cached EDA entry stale, and a model
+        # trained on another dataset's columns and scaler cannot serve this one
+        if fingerprint != self.dataset_fingerprint:
+            self.eda_cache.invalidate(keep=fingerprint)
+            if self._df is not None and self.parameters is not None:
+                logger.info("Active dataset changed; discarding the trained model")
+                self.parameters = None
+                self.threshold = DEFAULT_THRESHOLD
+                with self._landscape_lock:
+                    self._landscape_cache.clear()
+        self._df = df
+        self.dataset_fingerprint = fingerprint
+        self.dataset_id = dataset_id
+        self.feature_columns = list(feature_columns)
+        self.label_column = label_column
+        self.class_labels = list(class_labels)
+    
+    def load_dataset(self, meta, arrays):
+        """
+        Use a dataset from the registry (see datasets.DatasetRegistry.load).
+        The arrays are already split and scaled, so nothing is parsed or refitted.
+        """
+        with metrics.span('load_data', source='registry'):
+            df = dataset_frame(meta, arrays)
+            model_scaler = self._restored_model_scaler()
+            self._set_dataset(df, meta['fingerprint'], meta['dataset_id'], meta['feature_columns'],
+                              meta['label_column'], meta['label_values'])
+            
+            self.scaler = self._restore_scaler(meta['scaler']['mean'], meta['scaler']['scale'])
+            self.X_train = arrays['X_train']
+            self.X_test = arrays['X_test']
+            self.y_train = arrays['y_train']
+            self.y_test = arrays['y_test']
+            if model_scaler is not None:
+                self._use_scaler(model_scaler)
         
         return df
     
-    def get_eda_stats(self, df):
+    def get_eda_stats(self, df, dataset=None):
+        """
+        Return (stats, plots) for df, which is the bundled CSV or, when
+        `dataset` (registry metadata) is given, that dataset's frame. The
+        active dataset is left untouched. Results are memoized by dataset
+        fingerprint; plots missing from the cache are rendered in parallel.
+        """
+        if dataset is not None:
+            fingerprint = dataset['fingerprint']
+            feature_columns = dataset['feature_columns']
+            label_column = dataset['label_column']
+        else:
+            fingerprint = self.dataset_fingerprint
+            if fingerprint is None or df is not self._df:
+                fingerprint = dataset_fingerprint(df)
+            feature_columns = DEFAULT_FEATURE_COLUMNS
+            label_column = DEFAULT_LABEL_COLUMN
+        
+        plot_renderers = eda_plots(feature_columns, label_column)
+        cached = self.eda_cache.get(fingerprint)
+        if cached is not None and all(name in cached['plots'] for name in plot_renderers):
+            return cached['stats'], cached['plots']
+        
         # Calculate basic statistics
+        positive_rate = float(df[label_column].mean() * 100)
         stats = {
             'total_samples': len(df),
-            'placement_rate': df['placement'].mean() * 100,
+            'placement_rate': positive_rate,
+            'positive_rate': positive_rate,
             'train_test_split': '80/20',
+            'feature_columns': list(feature_columns),
+            'label_column': label_column,
             'features': {
-                'cgpa': {
-                    'mean': df['cgpa'].mean(),
-                    'median': df['cgpa'].median(),
-                    'min': df['cgpa'].min(),
-                    'max': df['cgpa'].max()
-                },
-                'iq': {
-                    'mean': df['iq'].mean(),
-                    'median': df['iq'].median(),
-                    'min': df['iq'].min(),
-                    'max': df['iq'].max()
+                column: {
+                    'mean': float(df[column].mean()),
+                    'median': float(df[column].median()),
+                    'min': float(df[column].min()),
+                    'max': float(df[column].max())
                 }
+                for column in feature_columns
             }
         }
-        
-        # Generate plots
-        plots = {}
-        
-        # CGPA histogram
-        plt.figure(figsize=(10, 6))
-        sns.histplot(df['cgpa'], bins=10, kde=True)
-        plt.title('CGPA Distribution')
-        plt.xlabel('CGPA')
-        plt.ylabel('Frequency')
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        plots['cgpa_hist'] = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close()
-        
-        # IQ histogram
-        plt.figure(figsize=(10, 6))
-        sns.histplot(df['iq'], bins=15, kde=True)
-        plt.title('IQ Distribution')
-        plt.xlabel('IQ Score')
-        plt.ylabel('Frequency')
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        plots['iq_hist'] = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close()
-        
-        # Scatter plot
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x='cgpa', y='iq', hue='placement', data=df, palette=['red', 'green'])
-        plt.title('Placement based on CGPA and IQ')
-        plt.xlabel('CGPA')
-        plt.ylabel('IQ Score')
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png')
-        buffer.seek(0)
-        plots['scatter_plot'] = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close()
-        
+        if dataset is not None:
+            test_fraction = dataset['test_rows'] / (dataset['train_rows'] + dataset['test_rows'])
+            stats['train_test_split'] = f'{round(100 * (1 - test_fraction))}/{round(100 * test_fraction)}'
+        
+        # Render only the plots that are not cached yet. Each plot uses its own
+        # Figure object rather than pyplot's global state so they can run concurrently.
+        plots = dict(cached['plots']) if cached is not None else {}
+        missing = [name for name in plot_renderers if name not in plots]
+        with metrics.span('eda_render'), ThreadPoolExecutor(max_workers=max(1, len(missing))) as executor:
+            rendered = executor.map(lambda name: plot_renderers[name](df), missing)
+            plots.update(zip(missing, rendered))
+        
+        self.eda_cache.put(fingerprint, {'stats': stats, 'plots': plots})
         return stats, plots
     
     def initialize_parameters(self):
@@ -134,13 +343,13 @@ class NeuralNetwork:
         parameters['W2'] = np.random.randn(2, 1) * 0.01
         parameters['b2'] = np.zeros((1, 1))
         
-        # Print parameter shapes for debugging
-        print(f"W1 shape: {parameters['W1'].shape}")
-        print(f"b1 shape: {parameters['b1'].shape}")
-        print(f"W2 shape: {parameters['W2'].shape}")
-        print(f"b2 shape: {parameters['b2'].shape}")
+        # Log parameter shapes for debugging
+        logger.debug("Initialized parameters: " + ", ".join(
+            f"{key} {value.shape}" for key, value in parameters.items()))
         
         self.parameters = parameters
+        # A threshold tuned for the previous model does not carry over
+        self.threshold = DEFAULT_THRESHOLD
         return parameters
     
     def sigmoid(self, Z):
@@ -214,20 +423,22 @@ class NeuralNetwork:
 
         return parameters
     
-    def predict(self, X):
+    def predict_proba(self, X):
+        """
+        Positive-class probabilities for multiple samples in one forward pass.
+        X: input features with shape (n_features, n_samples)
+        """
+        A3, _ = self.L_layer_forward(X)
+        return A3
+    
+    def predict(self, X, threshold=None):
         """
         Make predictions for multiple samples.
         X: input features with shape (n_features, n_samples)
         """
-        m = X.shape[1]
-        predictions = np.zeros((1, m))
-        
-        for i in range(m):
-            x_i = X[:, i:i+1]  # Get one sample
-            A3, _ = self.L_layer_forward(x_i)
-            predictions[0, i] = 1 if A3[0, 0] >= 0.5 else 0
-        
-        return predictions
+        if threshold is None:
+            threshold = self.threshold
+        return (self.predict_proba(X) >= threshold).astype(float)
     
     def calculate_accuracy(self, predictions, Y):
         return np.mean(predictions[0] == Y)
@@ -259,11 +470,13 @@ class NeuralNetwork:
         Z = predictions.reshape(xx.shape)
         
         # Apply slight smoothing for a smoother boundary using Gaussian filter
+        from scipy.ndimage import gaussian_filter
         Z = gaussian_filter(Z, sigma=0.5)
         
-        # Generate plot with modern tech styling
-        plt.figure(figsize=(10, 8), facecolor='black')
-        plt.rcParams.update({
+        # Generate plot with modern tech styling. The style is scoped to this
+        # figure; updating rcParams globally would also turn EDA plots black
+        plt = _pyplot()
+        with plt.rc_context({
             'axes.facecolor': 'black',
             'axes.edgecolor': 'white',
             'axes.labelcolor': 'white',
@@ -272,56 +485,122 @@ class NeuralNetwork:
             'text.color': 'white',
             'figure.facecolor': 'black',
             'grid.color': '#444444'
-        })
-        
-        # Use a tech-themed colormap
-        cmap = plt.cm.RdBu
-        contour = plt.contourf(xx, yy, Z, alpha=0.7, cmap=cmap, levels=np.linspace(0, 1, 20))
-        
-        # Add contour lines for a clearer boundary
-        boundary_contour = plt.contour(xx, yy, Z, levels=[0.5], colors='white', linewidths=2)
-        
-        # Plot training points with glowing effect
-        pos_samples = np.where(Y == 1)[0]
-        neg_samples = np.where(Y == 0)[0]
-        
-        # Create scatter plots with better visibility
-        plt.scatter(X[0, pos_samples], X[1, pos_samples], c='#00ff88', 
-                    label='Placed', edgecolors='white', s=70, alpha=0.8, linewidth=1.5)
-        plt.scatter(X[0, neg_samples], X[1, neg_samples], c='#ff5566', 
-                    label='Not Placed', edgecolors='white', s=70, alpha=0.8, linewidth=1.5)
-        
-        # Add a light grid
-        plt.grid(True, linestyle='--', alpha=0.3)
+        }):
+            plt.figure(figsize=(10, 8), facecolor='black')
+            
+            # Use a tech-themed colormap
+            cmap = plt.cm.RdBu
+            contour = plt.contourf(xx, yy, Z, alpha=0.7, cmap=cmap, levels=np.linspace(0, 1, 20))
+            
+            # Add contour lines for a clearer boundary
+            boundary_contour = plt.contour(xx, yy, Z, levels=[0.5], colors='white', linewidths=2)
+            
+            # Plot training points with glowing effect
+            pos_samples = np.where(Y == 1)[0]
+            neg_samples = np.where(Y == 0)[0]
+            
+            # Create scatter plots with better visibility
+            plt.scatter(X[0, pos_samples], X[1, pos_samples], c='#00ff88', 
+                        label='Placed', edgecolors='white', s=70, alpha=0.8, linewidth=1.5)
+            plt.scatter(X[0, neg_samples], X[1, neg_samples], c='#ff5566', 
+                        label='Not Placed', edgecolors='white', s=70, alpha=0.8, linewidth=1.5)
+            
+            # Add a light grid
+            plt.grid(True, linestyle='--', alpha=0.3)
+            
+            plt.title('Decision Boundary', fontsize=16, fontweight='bold')
+            plt.xlabel('Normalized CGPA', fontsize=12)
+            plt.ylabel('Normalized IQ', fontsize=12)
+            plt.legend(frameon=True, facecolor='black', edgecolor='white')
+            
+            # Tighten layout and add padding
+            plt.tight_layout(pad=2.0)
+            
+            # Save figure with high DPI for better quality
+            buffer = BytesIO()
+            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+            buffer.seek(0)
+            boundary_img = base64.b64encode(buffer.getvalue()).decode('utf-8')
+            plt.close()
         
-        plt.title('Decision Boundary', fontsize=16, fontweight='bold')
-        plt.xlabel('Normalized CGPA', fontsize=12)
-        plt.ylabel('Normalized IQ', fontsize=12)
-        plt.legend(frameon=True, facecolor='black', edgecolor='white')
+        return boundary_img
+    
+    def generate_decision_grid(self, X, resolution=boundary_grid.GRID_RESOLUTION):
+        """
+        Probability of the positive class over a fixed resolution x resolution
+        grid covering the same area as generate_decision_boundary, quantized to
+        uint8. Returns (grid, extent) with extent = (x_min, x_max, y_min, y_max)
+        and grid rows running from y_min to y_max.
+        """
+        x_min, x_max = X[0, :].min() - 1, X[0, :].max() + 1
+        y_min, y_max = X[1, :].min() - 1, X[1, :].max() + 1
+        xx, yy = np.meshgrid(np.linspace(x_min, x_max, resolution), np.linspace(y_min, y_max, resolution))
         
-        # Tighten layout and add padding
-        plt.tight_layout(pad=2.0)
+        # L_layer_forward broadcasts over columns, so the whole grid is one forward pass
+        A3, _ = self.L_layer_forward(np.vstack([xx.ravel(), yy.ravel()]))
+        grid = boundary_grid.quantize(A3.reshape(xx.shape))
         
-        # Save figure with high DPI for better quality
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-        buffer.seek(0)
-        boundary_img = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        plt.close()
+        return grid, (x_min, x_max, y_min, y_max)
+    
+    def _record_decision_boundary(self, X, Y, epoch, boundary_format, initial=False):
+        """
+        Append a boundary frame to the training history and return the frame to
+        send in the training status. In 'grid' mode history frames after the
+        first are deltas, while the status always gets a self-contained keyframe
+        because a polling client may have missed earlier frames. Training
+        points go in boundary_points and the first history frame only. With
+        boundary_format None nothing is recorded. `initial` marks the frame
+        recorded before the first epoch, which shares epoch 0 with the frame
+        recorded after it.
+        """
+        if boundary_format is None:
+            return None
+        
+        marker = {'initial': True} if initial else {}
+        if boundary_format == 'grid':
+            with metrics.span('decision_boundary', format='grid'):
+                grid, extent = self.generate_decision_grid(X)
+            previous = self._last_boundary_grid
+            if previous is None:
+                # Points are the same for every frame, so they are recorded
+                # once per session rather than sent with each status
+                self.boundary_points = boundary_grid.grid_points(X, Y)
+            self.training_history['decision_boundaries'].append({
+                'epoch': epoch,
+                **marker,
+                'grid': boundary_grid.encode_frame(
+                    grid, extent, previous, points=self.boundary_points if previous is None else None)
+            })
+            self._last_boundary_grid = grid
+            return {
+                'epoch': epoch,
+                **marker,
+                'grid': boundary_grid.encode_frame(grid, extent)
+            }
         
-        return boundary_img
+        with metrics.span('decision_boundary', format='png'):
+            image = self.generate_decision_boundary(X, Y)
+        frame = {
+            'epoch': epoch,
+            **marker,
+            'image': image
+        }
+        self.training_history['decision_boundaries'].append(frame)
+        return frame
     
-    def train(self, learning_rate=0.01, epochs=100, callback=None):
+    def train(self, learning_rate=0.01, epochs=100, callback=None, boundary_format='png'):
         """
         Train the neural network using the specific implementation from original code.
+        boundary_format: 'png' renders decision boundary images, 'grid' records
+        quantized probability grids (see boundary_grid) for the client to draw,
+        None skips decision boundaries entirely.
         """
         # Initialize parameters if not already initialized
         if self.parameters is None:
             self.initialize_parameters()
         else:
-            print("Using existing parameters:")
-            for key, value in self.parameters.items():
-                print(f"{key} shape: {value.shape}")
+            logger.debug("Using existing parameters: " + ", ".join(
+                f"{key} {value.shape}" for key, value in self.parameters.items()))
         
         m = self.X_train.shape[0]
         X = self.X_train.T  # Transpose to (n_features, n_samples)
@@ -335,17 +614,15 @@ class NeuralNetwork:
             'biases': [],
             'decision_boundaries': []
         }
+        self._last_boundary_grid = None
+        self.boundary_points = None
+        latest_boundary = None
         
         epoch_loss = 0
         epoch_acc = 0
         
         # Generate initial decision boundary and immediately send status
         if callback:
-            # Print initial parameter values for debugging
-            print("Initial parameters before training:")
-            for key, value in self.parameters.items():
-                print(f"{key}:\n{value}")
-            
             # Save parameters for initial state
             weights = {}
             biases = {}
@@ -356,11 +633,7 @@ class NeuralNetwork:
                     biases[key] = value.tolist()
             
             # Generate initial decision boundary
-            boundary_img = self.generate_decision_boundary(X, Y)
-            self.training_history['decision_boundaries'].append({
-                'epoch': 0,
-                'image': boundary_img
-            })
+            latest_boundary = self._record_decision_boundary(X, Y, 0, boundary_format, initial=True)
             
             # Send initial status
             initial_status = {
@@ -370,13 +643,21 @@ class NeuralNetwork:
                 'accuracy': 0.0,
                 'current_weights': weights,
                 'current_biases': biases,
-                'decision_boundary': self.training_history['decision_boundaries'][-1]
+                'decision_boundary': latest_boundary
             }
-            print("Sending initial status with weights:", weights)
-            callback(initial_status)
+            logger.debug(f"Sending initial status with weights: {weights} and biases: {biases}")
+            with metrics.span('training_callback'):
+                callback(initial_status)
         
         for epoch in range(epochs):
             epoch_loss = 0
+            # Forward/update time is summed over the epoch and recorded once,
+            # so instrumentation costs two clock reads per sample: each step
+            # starts when the previous update finished
+            epoch_started = time.perf_counter()
+            forward_seconds = 0.0
+            update_seconds = 0.0
+            step_started = epoch_started
             
             # Train on each example individually (as in the original implementation)
             for i in range(m):
@@ -393,9 +674,18 @@ class NeuralNetwork:
                 epoch_loss += loss
                 
                 # Update parameters
+                forward_done = time.perf_counter()
                 self.parameters = self.update_parameters(
                     self.parameters, y_i, y_hat_value, cache['A2'], X_i, learning_rate
                 )
+                update_done = time.perf_counter()
+                forward_seconds += forward_done - step_started
+                update_seconds += update_done - forward_done
+                step_started = update_done
+            
+            metrics.observe('forward', forward_seconds)
+            metrics.observe('update', update_seconds)
+            metrics.SAMPLES.inc(m)
             
             # Average loss for this epoch
             avg_loss = epoch_loss / m
@@ -422,11 +712,7 @@ class NeuralNetwork:
             
             # Generate decision boundary
             if epoch % 10 == 0 or epoch == epochs - 1:  # Only generate every 10 epochs to save computation
-                boundary_img = self.generate_decision_boundary(X, Y)
-                self.training_history['decision_boundaries'].append({
-                    'epoch': epoch,
-                    'image': boundary_img
-                })
+                latest_boundary = self._record_decision_boundary(X, Y, epoch, boundary_format)
             
             # Callback with current progress
             if callback and (epoch % 2 == 0 or epoch == epochs - 1):
@@ -437,30 +723,40 @@ class NeuralNetwork:
                     'accuracy': float(accuracy),
                     'current_weights': weights,
                     'current_biases': biases,
-                    'decision_boundary': self.training_history['decision_boundaries'][-1] if len(self.training_history['decision_boundaries']) > 0 else None
+                    'decision_boundary': latest_boundary
                 }
-                callback(status)
+                with metrics.span('training_callback'):
+                    callback(status)
+            
+            metrics.observe('epoch', time.perf_counter() - epoch_started)
+            metrics.EPOCHS.inc()
                 
         return self.training_history
     
-    def evaluate(self):
+    def evaluate(self, threshold=None, curves=False, n_bins=10):
+        """
+        Metrics on the test set at `threshold` (the serving threshold by
+        default). With curves=True the same probabilities also give ROC/PR
+        curves, AUC, the best-F1 threshold and calibration bins.
+        """
+        if threshold is None:
+            threshold = self.threshold
+        
         X_test = self.X_test.T
         Y_test = self.y_test
         
-        # Make predictions
-        predictions = self.predict(X_test)
+        # One forward pass; every metric below is derived from these probabilities
+        probabilities = self.predict_proba(X_test)[0]
+        predictions = (probabilities >= threshold).astype(float)
         
         # Calculate accuracy
-        accuracy = self.calculate_accuracy(predictions, Y_test)
+        accuracy = np.mean(predictions == Y_test)
         
         # Calculate confusion matrix
-        Y_flat = Y_test
-        pred_flat = predictions.flatten()
-        
-        TP = np.sum((pred_flat == 1) & (Y_flat == 1))
-        TN = np.sum((pred_flat == 0) & (Y_flat == 0))
-        FP = np.sum((pred_flat == 1) & (Y_flat == 0))
-        FN = np.sum((pred_flat == 0) & (Y_flat == 1))
+        confusion = evaluation.confusion_at(Y_test, probabilities, threshold)
+        TP = confusion['true_positives']
+        FP = confusion['false_positives']
+        FN = confusion['false_negatives']
         
         # Calculate metrics
         precision = TP / (TP + FP) if (TP + FP) > 0 else 0
@@ -469,22 +765,136 @@ class NeuralNetwork:
         
         results = {
             'accuracy': float(accuracy),
-            'confusion_matrix': {
-                'true_positives': int(TP),
-                'true_negatives': int(TN),
-                'false_positives': int(FP),
-                'false_negatives': int(FN)
-            },
+            'confusion_matrix': confusion,
             'precision': float(precision),
             'recall': float(recall),
-            'f1_score': float(f1)
+            'f1_score': float(f1),
+            'threshold': float(threshold)
         }
         
+        if curves:
+            with metrics.span('threshold_sweep'):
+                results['threshold_analysis'] = evaluation.threshold_sweep(Y_test, probabilities, n_bins=n_bins)
+        
         return results
     
-    def predict_single(self, cgpa, iq):
+    def best_f1_threshold(self):
+        """
+        Threshold that maximizes F1 on the training split, so that evaluate()
+        still scores it on unseen test rows.
+        """
+        probabilities = self.predict_proba(self.X_train.T)[0]
+        return evaluation.threshold_sweep(self.y_train, probabilities)['best_f1']['threshold']
+    
+    def model_version(self, parameters=None):
+        """Digest of the parameters and dataset, used as a cache key."""
+        digest = hashlib.sha256(loss_landscape.flatten(parameters or self.parameters).tobytes())
+        digest.update((self.dataset_fingerprint or '').encode())
+        return digest.hexdigest()[:16]
+    
+    def loss_landscape(self, mode='random', axes=None, span=1.0, resolution=41, seed=0, trajectory=True):
+        """
+        Training loss and its in-plane gradient over a 2D slice of parameter
+        space around the current parameters (see loss_landscape.compute_landscape).
+        Results are cached per model version and slice settings.
+        """
+        if self.X_train is None:
+            raise ValueError('No training data loaded')
+        # Validated here because axes and span are part of the cache key
+        if axes is not None and (not isinstance(axes, (list, tuple)) or len(axes) != 2
+                                 or not all(isinstance(name, str) for name in axes)):
+            raise ValueError('axes must be a list of two parameter names')
+        if not np.isfinite(span):
+            raise ValueError('span must be a finite number')
+        
+        # Copy, since a running training thread updates the arrays in place
+        parameters = {name: value.copy() for name, value in self.parameters.items()}
+        version = self.model_version(parameters)
+        key = (version, mode, tuple(axes or ()), float(span), int(resolution), int(seed), bool(trajectory))
+        with self._landscape_lock:
+            if key in self._landscape_cache:
+                self._landscape_cache.move_to_end(key)
+                return self._landscape_cache[key]
+        
+        with metrics.span('loss_landscape', mode=mode):
+            landscape, origin, directions = loss_landscape.compute_landscape(
+                parameters, self.X_train.T, self.y_train,
+                mode=mode, axes=axes, span=span, resolution=resolution, seed=seed
+            )
+        landscape['model_version'] = version
+        if trajectory:
+            landscape['trajectory'] = loss_landscape.project_trajectory(
+                self.training_history['weights'], self.training_history['biases'], origin, directions
+            )
+        
+        with self._landscape_lock:
+            self._landscape_cache[key] = landscape
+            while len(self._landscape_cache) > LANDSCAPE_CACHE_SIZE:
+                self._landscape_cache.popitem(last=False)
+        return landscape
+    
+    def check_cv_folds(self, k):
+        """
+        Raise ValueError unless stratified k-fold can run on the loaded
+        dataset, i.e. every class has at least k rows.
+        """
+        if self._df is None:
+            raise ValueError('No dataset loaded')
+        if k < 2:
+            raise ValueError('k must be at least 2')
+        smallest_class = int(self._df[self.label_column].value_counts().min())
+        if k > smallest_class:
+            raise ValueError(f'k must not exceed the smallest class size ({smallest_class})')
+    
+    def cross_validate(self, k=5, learning_rate=0.01, epochs=100, max_workers=None, random_state=42):
+        """
+        Stratified k-fold cross-validation on the loaded dataset. Each fold runs
+        train + evaluate in its own worker process, so the wall time stays close
+        to a single training run when there are at least k cores. Returns
+        per-fold metrics plus their mean, standard deviation and variance.
+        """
+        self.check_cv_folds(k)
+        
+        from sklearn.model_selection import StratifiedKFold
+        
+        X = self._df[self.feature_columns].values.astype(float)
+        y = self._df[self.label_column].values
+        folds = StratifiedKFold(n_splits=k, shuffle=True, random_state=random_state).split(X, y)
+        
+        # spawn rather than fork: the Flask process runs other threads, and a
+        # forked child would inherit their locks in whatever state they were in
+        context = multiprocessing.get_context('spawn')
+        workers = min(k, max_workers or os.cpu_count() or 1)
+        with metrics.span('cross_validate'), \
+                ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(_train_and_evaluate_fold, fold, X, y, train_idx, test_idx, learning_rate, epochs)
+                for fold, (train_idx, test_idx) in enumerate(folds)
+            ]
+            fold_results = [future.result() for future in futures]
+        
+        aggregate = {}
+        for name in CV_METRICS:
+            values = np.array([result[name] for result in fold_results])
+            aggregate[name] = {
+                'mean': float(values.mean()),
+                'std': float(values.std(ddof=1)) if k > 1 else 0.0,
+                'variance': float(values.var(ddof=1)) if k > 1 else 0.0,
+                'min': float(values.min()),
+                'max': float(values.max())
+            }
+        
+        return {
+            'k': k,
+            'learning_rate': learning_rate,
+            'epochs': epochs,
+            'folds': fold_results,
+            'aggregate': aggregate
+        }
+    
+    def predict_single(self, *features):
         # Scale input using the same scaler used during training
-        input_data = np.array([[cgpa, iq]])
+        input_data = np.array([features], dtype=float)
         input_scaled = self.scaler.transform(input_data)
         
         # Reshape for forward propagation
@@ -492,24 +902,33 @@ class NeuralNetwork:
         
         # Make prediction
         A3, _ = self.L_layer_forward(X)
-        prediction = 1 if A3[0, 0] > 0.5 else 0
+        prediction = 1 if A3[0, 0] >= self.threshold else 0
         probability = float(A3[0, 0])
         
         return {
             'prediction': int(prediction),
             'probability': probability,
-            'label': 'PLACED ✅' if prediction == 1 else 'NOT PLACED ❌',
+            'label': self.class_labels[prediction],
+            'threshold': float(self.threshold),
             'input': {
-                'cgpa': float(cgpa),
-                'iq': float(iq)
+                column: float(value) for column, value in zip(self.feature_columns, features)
             },
             'scaled_input': {
-                'cgpa': float(input_scaled[0, 0]),
-                'iq': float(input_scaled[0, 1])
+                column: float(value) for column, value in zip(self.feature_columns, input_scaled[0])
             }
         }
     
-    def save_model(self, filepath='model.json'):
+    def save_model(self, filepath='model.nnv'):
+        """
+        Save the model. Paths ending in .json use the legacy JSON layout,
+        everything else is written in the binary format from model_format.
+        """
+        if not filepath.endswith('.json'):
+            return model_format.write_model(
+                filepath, self.parameters, self.layer_dimensions,
+                self.scaler.mean_, self.scaler.scale_
+            )
+
         model_data = {
             'parameters': {},
             'layer_dimensions': self.layer_dimensions,
@@ -528,21 +947,67 @@ class NeuralNetwork:
             
         return filepath
     
-    def load_model(self, filepath='model.json'):
-        with open(filepath, 'r') as f:
-            model_data = json.load(f)
-        
-        # Set layer dimensions (should always be [2, 2, 1] for this fixed architecture)
-        self.layer_dimensions = model_data['layer_dimensions']
+    def load_model(self, filepath='model.nnv'):
+        """
+        Load a model saved in either the binary or the legacy JSON format.
+        Raises model_format.ModelFormatError if the file is not a valid model.
+        """
+        if model_format.is_binary_model(filepath):
+            model_data = model_format.read_model(filepath)
+        else:
+            try:
+                with open(filepath, 'r') as f:
+                    model_data = json.load(f)
+                model_data['parameters'] = {
+                    key: np.array(value, dtype=float) for key, value in model_data['parameters'].items()
+                }
+                model_data['scaler'] = {
+                    'mean': np.array(model_data['scaler']['mean'], dtype=float),
+                    'scale': np.array(model_data['scaler']['scale'], dtype=float)
+                }
+                if 'layer_dimensions' not in model_data:
+                    raise KeyError('layer_dimensions')
+            except model_format.ModelFormatError:
+                raise
+            except (UnicodeDecodeError, ValueError, KeyError, TypeError, AttributeError) as e:
+                raise model_format.ModelFormatError(f'Invalid JSON model file: {e}')
+            model_format.validate_model(model_data['layer_dimensions'], model_data['parameters'],
+                                        model_data['scaler']['mean'], model_data['scaler']['scale'])
+        
+        # The forward pass is written for the fixed [2, 2, 1] architecture
+        if list(model_data['layer_dimensions']) != ARCHITECTURE:
+            raise model_format.ModelFormatError(
+                f"Model architecture {model_data['layer_dimensions']} does not match {ARCHITECTURE}")
+        self.layer_dimensions = list(model_data['layer_dimensions'])
         
         # Load parameters
-        self.parameters = {}
-        for key, value in model_data['parameters'].items():
-            self.parameters[key] = np.array(value)
+        self.parameters = dict(model_data['parameters'])
         
-        # Create and setup scaler
-        self.scaler = StandardScaler()
-        self.scaler.mean_ = np.array(model_data['scaler']['mean'])
-        self.scaler.scale_ = np.array(model_data['scaler']['scale'])
+        # Create and setup scaler; a loaded split is rescaled to it
+        self._use_scaler(self._restore_scaler(model_data['scaler']['mean'], model_data['scaler']['scale']))
+        self.threshold = DEFAULT_THRESHOLD
         
-        return True
\ No newline at end of file
+        # The previous run's weight path (and any landscape projecting it)
+        # does not belong to the loaded model
+        self.training_history = {
+            'loss': [],
+            'accuracy': [],
+            'weights': [],
+            'biases': [],
+            'decision_boundaries': []
+        }
+        with self._landscape_lock:
+            self._landscape_cache.clear()
+        
+        return True
+    
+    @staticmethod
+    def _restore_scaler(mean, scale):
+        """A fitted StandardScaler rebuilt from stored statistics."""
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler()
+        scaler.mean_ = np.asarray(mean, dtype=float)
+        scaler.scale_ = np.asarray(scale, dtype=float)
+        scaler.var_ = scaler.scale_ ** 2
+        scaler.n_features_in_ = scaler.mean_.shape[0]
+        return scaler
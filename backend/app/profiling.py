@@ -0,0 +1,81 @@
+import cProfile
+import json
+import pstats
+import time
+import tracemalloc
+
+# On-demand profiling of a single training job. cProfile records the calling
+# thread only, so it sees just the profiled job; tracemalloc is process-wide,
+# so allocations made concurrently by other requests are included too.
+
+TRACEMALLOC_FRAMES = 10
+
+
+def _hotspots(stats, sort_key, top_n):
+    rows = []
+    for (filename, line, function), (primitive_calls, calls, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': function,
+            'location': f'{filename}:{line}',
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'total_seconds': total,
+            'cumulative_seconds': cumulative
+        })
+    rows.sort(key=lambda row: row[sort_key], reverse=True)
+    return rows[:top_n]
+
+
+def run_profiled(fn, *args, top_n=20, **kwargs):
+    """
+    Call fn(*args, **kwargs) under cProfile and tracemalloc. Returns
+    (result, profiler, summary) where summary holds the top_n functions by own
+    and cumulative time, the top_n allocation sites and the peak traced memory.
+    """
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        after = tracemalloc.take_snapshot()
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+    stats = pstats.Stats(profiler)
+    allocations = [
+        {
+            'location': str(stat.traceback[0]),
+            'size_diff_bytes': stat.size_diff,
+            'count_diff': stat.count_diff
+        }
+        for stat in after.compare_to(before, 'lineno')[:top_n]
+    ]
+    summary = {
+        'wall_seconds': elapsed,
+        'total_calls': stats.total_calls,
+        'top_by_total_time': _hotspots(stats, 'total_seconds', top_n),
+        'top_by_cumulative_time': _hotspots(stats, 'cumulative_seconds', top_n),
+        'memory': {
+            'peak_bytes': peak_bytes,
+            'current_bytes': current_bytes,
+            'top_allocations': allocations
+        }
+    }
+    return result, profiler, summary
+
+
+def write_profile(profiler, summary, stats_path, summary_path):
+    """Save the raw pstats dump (for snakeviz, pstats etc.) and the JSON summary."""
+    profiler.dump_stats(stats_path)
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f)
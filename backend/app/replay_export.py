@@ -0,0 +1,366 @@
+import base64
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import numpy as np
+
+from . import boundary_grid
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Export of a recorded training session as an animated GIF or MP4. Frames are
+# read one at a time from the session's frame log (<session>_frames.ndjson,
+# written when training finishes and the only copy of the frames; the session
+# JSON holds the rest of the history) and rendered with loss/accuracy
+# overlays. Exports run on a small background pool and the output file is
+# reused for later requests with the same settings.
+#
+# MP4 needs an ffmpeg binary on PATH; frames are piped to it as raw RGB one at
+# a time. GIFs are written with Pillow (already installed with matplotlib),
+# which keeps every frame of the animation in memory until the file is
+# written, so a GIF uses at most MAX_GIF_FRAMES evenly spaced frames.
+
+FORMATS = {'gif': 'image/gif', 'mp4': 'video/mp4'}
+DEFAULT_FPS = 4
+DEFAULT_SIZE = 480
+MAX_GIF_FRAMES = 150
+OVERLAY_HEIGHT = 96
+
+# Same colour ramp as the client (NeuralNetworkVisualizer.tsx): red (0) ->
+# near white (0.5) -> blue (1), drawn at 180/255 opacity over black
+_RDBU_STOPS = np.array([[178, 24, 43], [239, 138, 98], [247, 247, 247], [103, 169, 207], [33, 102, 172]], dtype=float)
+_LUT = (np.stack([
+    np.interp(np.arange(256) / 255 * (len(_RDBU_STOPS) - 1), np.arange(len(_RDBU_STOPS)), _RDBU_STOPS[:, c])
+    for c in range(3)
+], axis=1) * 180 / 255).astype(np.uint8)
+
+POSITIVE_COLOR = (0, 255, 136)
+NEGATIVE_COLOR = (255, 85, 102)
+LOSS_COLOR = (255, 170, 60)
+ACCURACY_COLOR = (77, 195, 255)
+
+
+class ExportError(ValueError):
+    """Raised when a session cannot be exported, e.g. it recorded no frames."""
+
+
+class ExportUnavailableError(RuntimeError):
+    """Raised when the encoder for a format is not installed."""
+
+
+def _pil():
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError:
+        raise ExportUnavailableError('Pillow is required for replay export')
+    return Image, ImageDraw, ImageFont
+
+
+def frame_log_path(session_path):
+    return session_path[:-len('.json')] + '_frames.ndjson'
+
+
+def write_frame_log(path, history):
+    """
+    Write a session's boundary frames as NDJSON: a header line with the loss
+    and accuracy curves, then one line per frame, so exports can read frames
+    one at a time instead of loading the whole session.
+    """
+    frames = history.get('decision_boundaries', [])
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps({'loss': history['loss'], 'accuracy': history['accuracy'], 'frames': len(frames)}) + '\n')
+        for frame in frames:
+            f.write(json.dumps(frame) + '\n')
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_frame_log(path):
+    """Return (header, frame iterator); the file is read lazily and closed when the iterator is."""
+    f = open(path, 'r')
+    header = json.loads(f.readline())
+    if 'frames' not in header:
+        # Logs written before the header recorded the frame count
+        with open(path, 'r') as counted:
+            header['frames'] = sum(1 for line in counted if line.strip()) - 1
+
+    def frames():
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, frames()
+
+
+def session_history(history):
+    """The history to store in the session JSON: everything but the frames."""
+    return {key: value for key, value in history.items() if key != 'decision_boundaries'}
+
+
+def read_session_frames(session_path):
+    """
+    (header, frame iterator) for a session. Sessions recorded before frame
+    logs existed are loaded whole from the session JSON instead.
+    """
+    log_path = frame_log_path(session_path)
+    if os.path.exists(log_path):
+        return read_frame_log(log_path)
+    with open(session_path, 'r') as f:
+        history = json.load(f).get('history', {})
+    frames = history.get('decision_boundaries', [])
+    header = {'loss': history.get('loss', []), 'accuracy': history.get('accuracy', []), 'frames': len(frames)}
+    return header, iter(frames)
+
+
+def _render_grid(values, extent, points, size):
+    """Colour-mapped probability grid with the 0.5 contour and training points."""
+    Image, ImageDraw, _ = _pil()
+
+    positive = values >= 128
+    boundary = np.zeros_like(positive)
+    boundary[:, :-1] |= positive[:, :-1] != positive[:, 1:]
+    boundary[:-1, :] |= positive[:-1, :] != positive[1:, :]
+    rgb = _LUT[values]
+    rgb[boundary] = 255
+
+    # Rows run from y_min to y_max, so flip them to put y_min at the bottom
+    image = Image.fromarray(np.ascontiguousarray(rgb[::-1]), 'RGB').resize((size, size), Image.BILINEAR)
+    draw = ImageDraw.Draw(image)
+    x_min, x_max, y_min, y_max = extent
+    for x, y, label in points or []:
+        px = (x - x_min) / (x_max - x_min) * size
+        py = size - (y - y_min) / (y_max - y_min) * size
+        draw.ellipse((px - 4, py - 4, px + 4, py + 4),
+                     fill=POSITIVE_COLOR if label == 1 else NEGATIVE_COLOR, outline='white')
+    return image
+
+
+def _render_png(image_b64, size):
+    Image, _, _ = _pil()
+    image = Image.open(BytesIO(base64.b64decode(image_b64))).convert('RGB')
+    image.thumbnail((size, size), Image.BILINEAR)
+    canvas = Image.new('RGB', (size, size), 'black')
+    canvas.paste(image, ((size - image.width) // 2, (size - image.height) // 2))
+    return canvas
+
+
+def _sparkline(draw, values, upto, box, color):
+    if len(values) < 2:
+        return
+    left, top, right, bottom = box
+    series = np.asarray(values, dtype=float)
+    low, high = float(series.min()), float(series.max())
+    span = (high - low) or 1.0
+    xs = left + np.arange(len(series)) / (len(series) - 1) * (right - left)
+    ys = bottom - (series - low) / span * (bottom - top)
+    draw.line(list(zip(xs.tolist(), ys.tolist())), fill=tuple(c // 3 for c in color), width=1)
+    end = min(upto, len(series) - 1) + 1
+    if end >= 2:
+        draw.line(list(zip(xs[:end].tolist(), ys[:end].tolist())), fill=color, width=2)
+
+
+def _add_overlay(image, epoch, header, initial=False):
+    """
+    Append a strip with the epoch, loss and accuracy, and both curves up to
+    this epoch. The frame recorded before training is labelled as such.
+    """
+    Image, ImageDraw, ImageFont = _pil()
+    width = image.width
+    framed = Image.new('RGB', (width, image.height + OVERLAY_HEIGHT), (10, 17, 34))
+    framed.paste(image, (0, 0))
+    draw = ImageDraw.Draw(framed)
+    font = ImageFont.load_default()
+
+    loss, accuracy = header.get('loss', []), header.get('accuracy', [])
+    top = image.height + 8
+    if initial:
+        text = 'Initial state (before training)'
+        upto = -1
+    else:
+        text = f'Epoch {epoch + 1}/{len(loss) or "?"}'
+        if epoch < len(loss):
+            text += f'    loss {loss[epoch]:.4f}'
+        if epoch < len(accuracy):
+            text += f'    accuracy {accuracy[epoch] * 100:.1f}%'
+        upto = epoch
+    draw.text((10, top), text, fill='white', font=font)
+
+    chart = (10, top + 20, width - 10, image.height + OVERLAY_HEIGHT - 10)
+    _sparkline(draw, loss, upto, chart, LOSS_COLOR)
+    _sparkline(draw, accuracy, upto, chart, ACCURACY_COLOR)
+    return framed
+
+
+def render_frames(header, frames, size=DEFAULT_SIZE, limit=None):
+    """
+    Yield one RGB PIL image per recorded boundary frame, in order. With
+    `limit`, only that many evenly spaced frames (first and last included)
+    are rendered; grid deltas are still decoded for every frame.
+    """
+    count = header.get('frames', 0)
+    keep = None
+    if limit is not None and count > limit:
+        keep = set(np.linspace(0, count - 1, limit).round().astype(int).tolist())
+    previous = None
+    points = None
+    for index, frame in enumerate(frames):
+        if 'grid' in frame:
+            grid = frame['grid']
+            previous = boundary_grid.decode_frame(grid, previous)
+            points = grid.get('points') or points
+            if keep is not None and index not in keep:
+                continue
+            image = _render_grid(previous, grid['extent'], points, size)
+        elif frame.get('image'):
+            if keep is not None and index not in keep:
+                continue
+            image = _render_png(frame['image'], size)
+        else:
+            continue
+        # Sessions recorded before frames were marked always start with the initial state
+        yield _add_overlay(image, frame['epoch'], header, frame.get('initial', index == 0))
+
+
+def _encode_gif(images, output_path, fps):
+    first = next(images, None)
+    if first is None:
+        raise ExportError('The session has no decision boundary frames')
+    first.save(output_path, format='GIF', save_all=True, append_images=images,
+               duration=int(1000 / fps), loop=0, optimize=False)
+
+
+def _encode_mp4(images, output_path, fps):
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        raise ExportUnavailableError('MP4 export needs ffmpeg on PATH')
+    first = next(images, None)
+    if first is None:
+        raise ExportError('The session has no decision boundary frames')
+
+    # libx264 with yuv420p needs even dimensions
+    width, height = first.width // 2 * 2, first.height // 2 * 2
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', '-movflags', '+faststart', '-f', 'mp4', output_path
+    ]
+    # Leaving the with block closes the pipes and waits for ffmpeg
+    with subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+        try:
+            try:
+                process.stdin.write(first.crop((0, 0, width, height)).tobytes())
+                for image in images:
+                    process.stdin.write(image.crop((0, 0, width, height)).tobytes())
+                process.stdin.close()
+            except BrokenPipeError:
+                pass  # ffmpeg exited early; its error output is reported below
+            stderr = process.stderr.read().decode('utf-8', 'replace')
+        except BaseException:
+            # A rendering error must not leave ffmpeg writing to a file the caller removes
+            process.kill()
+            process.wait()
+            raise
+    if process.returncode != 0:
+        raise ExportError(f'ffmpeg failed: {stderr.strip()[-500:]}')
+
+
+ENCODERS = {'gif': _encode_gif, 'mp4': _encode_mp4}
+# Frames the encoder holds in memory at once; None means they are streamed
+FRAME_LIMITS = {'gif': MAX_GIF_FRAMES, 'mp4': None}
+
+
+def export_session(session_path, output_path, fmt='gif', fps=DEFAULT_FPS, size=DEFAULT_SIZE):
+    """Render and encode a session's frames into output_path (written atomically)."""
+    header, frames = read_session_frames(session_path)
+    tmp_path = f'{output_path}.tmp'
+    try:
+        with metrics.span('replay_export', format=fmt):
+            images = render_frames(header, frames, size, limit=FRAME_LIMITS[fmt])
+            ENCODERS[fmt](images, tmp_path, fps)
+        os.replace(tmp_path, output_path)
+    finally:
+        if hasattr(frames, 'close'):
+            frames.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path
+
+
+class ExportJobs:
+    """
+    Background export jobs, one per (session, format, fps, size). A job whose
+    output file already exists is reported as done without re-encoding.
+    """
+
+    def __init__(self, sessions_dir, output_dir, max_workers=2):
+        self.sessions_dir = sessions_dir
+        self.output_dir = output_dir
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='replay-export')
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def job_id(session_id, fmt, fps, size):
+        return f'{session_id}_{fps}fps_{size}px.{fmt}'
+
+    def session_path(self, session_id):
+        return os.path.join(self.sessions_dir, f'{session_id}.json')
+
+    def output_path(self, job_id):
+        return os.path.join(self.output_dir, job_id)
+
+    def status(self, job_id):
+        """{'job_id', 'status', 'error'} with status pending, running, done, failed or unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+        if os.path.exists(self.output_path(job_id)):
+            return {'job_id': job_id, 'status': 'done', 'error': None}
+        return {'job_id': job_id, 'status': 'unknown', 'error': None}
+
+    def submit(self, session_id, fmt='gif', fps=DEFAULT_FPS, size=DEFAULT_SIZE):
+        """Start an export unless it is cached or already queued; returns its status."""
+        if fmt not in FORMATS:
+            raise ExportError(f"format must be one of {', '.join(FORMATS)}")
+        if fmt == 'mp4' and shutil.which('ffmpeg') is None:
+            raise ExportUnavailableError('MP4 export needs ffmpeg on PATH')
+        session_path = self.session_path(session_id)
+        if not os.path.exists(session_path):
+            raise FileNotFoundError(session_path)
+
+        job_id = self.job_id(session_id, fmt, fps, size)
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job['status'] in ('pending', 'running', 'done'):
+                return dict(job)
+            if os.path.exists(self.output_path(job_id)):
+                return {'job_id': job_id, 'status': 'done', 'error': None}
+            self._jobs[job_id] = {'job_id': job_id, 'status': 'pending', 'error': None}
+
+        self._executor.submit(self._run, job_id, session_path, fmt, fps, size)
+        return self.status(job_id)
+
+    def _set(self, job_id, status, error=None):
+        with self._lock:
+            self._jobs[job_id] = {'job_id': job_id, 'status': status, 'error': error}
+
+    def _run(self, job_id, session_path, fmt, fps, size):
+        self._set(job_id, 'running')
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            export_session(session_path, self.output_path(job_id), fmt, fps, size)
+        except Exception as e:
+            logger.error(f"Replay export {job_id} failed: {str(e)}")
+            self._set(job_id, 'failed', str(e))
+            return
+        self._set(job_id, 'done')
@@ -0,0 +1,261 @@
+"""
+Benchmark suite for training, inference, rendering, EDA and the API routes.
+
+Every benchmark runs against synthetic placement-style datasets (cgpa, iq,
+placement) of the requested sizes, and the results are written as JSON so two
+runs can be compared:
+
+    cd backend
+    python benchmarks/bench.py --samples 200 2000 --output bench_results.json
+    python benchmarks/bench.py --samples 200 --compare bench_results.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.neural_network import NeuralNetwork  # noqa: E402
+from app.eda_cache import EDACache  # noqa: E402
+
+BENCHMARKS = ['train', 'predict', 'boundary', 'landscape', 'eda', 'api']
+
+
+def make_dataset(path, n_samples, seed=0):
+    """Write a CSV shaped like placement-dataset.csv with n_samples rows."""
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    cgpa = np.clip(rng.normal(6.9, 1.0, n_samples), 4.0, 10.0).round(1)
+    iq = np.clip(rng.normal(120, 25, n_samples), 40, 200).round()
+    logit = 2.5 * (cgpa - 6.9) + 0.02 * (iq - 120) + rng.normal(0, 0.5, n_samples)
+    placement = (logit > 0).astype(int)
+    pd.DataFrame({
+        'row': np.arange(n_samples), 'cgpa': cgpa, 'iq': iq, 'placement': placement
+    }).to_csv(path, index=False)
+    return path
+
+
+def timed(fn, repeats):
+    """Run fn `repeats` times and return the wall time of each run in seconds."""
+    durations = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def summarize(durations, units=1):
+    """Latency percentiles in milliseconds plus throughput in `units` per second."""
+    ordered = sorted(durations)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+    median = statistics.median(ordered)
+    return {
+        'runs': len(ordered),
+        'p50_ms': median * 1000,
+        'p99_ms': pick(0.99) * 1000,
+        'min_ms': ordered[0] * 1000,
+        'per_second': units / median if median > 0 else float('inf')
+    }
+
+
+def trained_network(csv_path, epochs):
+    nn = NeuralNetwork()
+    nn.load_and_preprocess_data(csv_path)
+    nn.initialize_parameters()
+    nn.train(epochs=epochs, boundary_format='grid')  # skip PNG rendering during setup
+    return nn
+
+
+def bench_train(csv_path, args):
+    nn = NeuralNetwork()
+    nn.load_and_preprocess_data(csv_path)
+
+    def run():
+        nn.initialize_parameters()
+        nn.train(epochs=args.epochs, boundary_format=args.boundary_format)
+
+    result = summarize(timed(run, args.repeats), units=args.epochs)
+    result['epochs_per_second'] = result.pop('per_second')
+    return result
+
+
+def bench_predict(csv_path, args):
+    nn = trained_network(csv_path, epochs=1)
+    X = nn.X_train.T
+
+    result = summarize(timed(lambda: nn.predict(X), args.repeats), units=X.shape[1])
+    result['predictions_per_second'] = result.pop('per_second')
+    return result
+
+
+def bench_boundary(csv_path, args):
+    nn = trained_network(csv_path, epochs=1)
+    X, Y = nn.X_train.T, nn.y_train
+
+    results = {}
+    for name, fn in (
+        ('png', lambda: nn.generate_decision_boundary(X, Y)),
+        ('grid', lambda: nn.generate_decision_grid(X)),
+    ):
+        result = summarize(timed(fn, args.repeats))
+        result['frames_per_second'] = result.pop('per_second')
+        results[name] = result
+    return results
+
+
+def bench_landscape(csv_path, args):
+    nn = trained_network(csv_path, epochs=1)
+
+    def run():
+        nn._landscape_cache.clear()  # measure the computation, not the cache
+        nn.loss_landscape(resolution=41)
+
+    result = summarize(timed(run, args.repeats))
+    result['slices_per_second'] = result.pop('per_second')
+    return result
+
+
+def bench_eda(csv_path, args):
+    nn = NeuralNetwork()
+    df = nn.load_and_preprocess_data(csv_path)
+
+    def cold():
+        # A fresh in-memory cache forces every plot to be rendered again
+        nn.eda_cache = EDACache()
+        nn.get_eda_stats(df)
+
+    cold_result = summarize(timed(cold, args.repeats))
+    cached_result = summarize(timed(lambda: nn.get_eda_stats(df), args.requests))
+    for result in (cold_result, cached_result):
+        result.pop('per_second')
+    return {'cold': cold_result, 'cached': cached_result}
+
+
+def bench_api(csv_path, args):
+    # app.api writes models and sessions relative to the working directory
+    workdir = tempfile.TemporaryDirectory(prefix='nnv-bench-')
+    previous_cwd = os.getcwd()
+    os.chdir(workdir.name)
+    try:
+        from app import api
+
+        api.nn = trained_network(csv_path, epochs=args.epochs)
+        api.df = api.nn._df
+        client = api.app.test_client()
+
+        requests = {
+            'GET /api/eda': lambda: client.get('/api/eda'),
+            'POST /api/predict': lambda: client.post('/api/predict', json={'cgpa': 7.1, 'iq': 115}),
+            'GET /api/evaluate': lambda: client.get('/api/evaluate'),
+            'GET /api/train/status': lambda: client.get('/api/train/status'),
+            'GET /api/model/state': lambda: client.get('/api/model/state'),
+        }
+
+        results = {}
+        for name, send in requests.items():
+            response = send()  # warm-up request, also checks the route works
+            if response.status_code != 200:
+                raise RuntimeError(f'{name} returned {response.status_code}')
+            results[name] = summarize(timed(send, args.requests))
+            results[name]['requests_per_second'] = results[name].pop('per_second')
+        return results
+    finally:
+        os.chdir(previous_cwd)
+        workdir.cleanup()
+
+
+BENCHMARK_FUNCTIONS = {
+    'train': bench_train,
+    'predict': bench_predict,
+    'boundary': bench_boundary,
+    'landscape': bench_landscape,
+    'eda': bench_eda,
+    'api': bench_api,
+}
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def flatten(results, prefix=''):
+    """Yield (dotted.key, value) for every numeric leaf."""
+    for key, value in results.items():
+        name = f'{prefix}.{key}' if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+
+def compare(current, baseline_path):
+    """Print the ratio current/baseline for every latency metric present in both runs."""
+    with open(baseline_path, 'r') as f:
+        baseline = dict(flatten(json.load(f)['results']))
+    print(f'\nComparison against {baseline_path} (latency ratio, < 1 is faster):')
+    for name, value in flatten(current):
+        if name.endswith('p50_ms') and baseline.get(name):
+            print(f'    {name:<60} {value / baseline[name]:6.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--samples', type=int, nargs='+', default=[200, 2000],
+                        help='Synthetic dataset sizes to benchmark')
+    parser.add_argument('--epochs', type=int, default=5, help='Epochs per training run')
+    parser.add_argument('--boundary-format', choices=['png', 'grid'], default='grid',
+                        help='Decision boundary frames recorded during the train benchmark')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs of each slow benchmark')
+    parser.add_argument('--requests', type=int, default=50, help='Requests per API endpoint / cached EDA call')
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='Run only these benchmarks')
+    parser.add_argument('--output', default='bench_results.json', help='JSON file to write')
+    parser.add_argument('--compare', help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='nnv-data-') as data_dir:
+        for n_samples in args.samples:
+            csv_path = make_dataset(os.path.join(data_dir, f'placement_{n_samples}.csv'), n_samples)
+            results[f'samples_{n_samples}'] = size_results = {}
+            for name in args.only or BENCHMARKS:
+                print(f'[{n_samples} samples] {name}...', flush=True)
+                size_results[name] = BENCHMARK_FUNCTIONS[name](csv_path, args)
+
+    report = {
+        'environment': environment(),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare')},
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
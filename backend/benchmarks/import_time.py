@@ -0,0 +1,97 @@
+"""
+Import-time benchmark for the backend.
+
+Runs `python -X importtime` in a fresh interpreter for each target module,
+checks the total import time against a per-module startup budget and lists
+the third-party packages that contribute most to it.
+
+    cd backend
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module app.api --top 15
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Startup budget in milliseconds for importing each module in a cold interpreter
+BUDGETS_MS = {
+    'app.model_format': 250,
+    'app.eda_cache': 100,
+    'app.neural_network': 300,
+    'app.api': 800,
+}
+
+
+def measure(module):
+    """
+    Import `module` in a fresh interpreter and return (total_ms, packages_ms)
+    where packages_ms maps each top-level package to its cumulative import time.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        last_line = result.stderr.strip().splitlines()[-1]
+        raise RuntimeError(f'Importing {module} failed: {last_line}')
+
+    own_package = module.split('.')[0]
+    packages = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indent><name>"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        cumulative_us = int(cumulative)
+        if depth == 0:
+            total_us += cumulative_us
+        # The outermost import of a package has the largest cumulative time
+        # and already includes all of its submodules.
+        top_level = name.split('.')[0]
+        if top_level != own_package:
+            packages[top_level] = max(packages.get(top_level, 0), cumulative_us / 1000)
+
+    return total_us / 1000, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--module', action='append',
+                        help='Module to import (repeatable). Defaults to every budgeted module.')
+    parser.add_argument('--top', type=int, default=8, help='Number of packages to list per module')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    args = parser.parse_args()
+
+    modules = args.module or list(BUDGETS_MS)
+    results = {}
+    over_budget = False
+
+    for module in modules:
+        total_ms, packages = measure(module)
+        budget_ms = BUDGETS_MS.get(module)
+        ok = budget_ms is None or total_ms <= budget_ms
+        over_budget = over_budget or not ok
+        results[module] = {'total_ms': total_ms, 'budget_ms': budget_ms, 'packages_ms': packages}
+
+        status = 'no budget' if budget_ms is None else ('ok' if ok else 'OVER BUDGET')
+        budget_text = '-' if budget_ms is None else f'{budget_ms} ms'
+        print(f'{module}: {total_ms:.1f} ms (budget {budget_text}) {status}')
+        for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+            print(f'    {name:<28} {ms:8.1f} ms')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,7 @@
 // frontend/src/components/ChatbotWidget.tsx
 import React, { useState, useRef, useEffect } from 'react';
 import styled, { keyframes, css } from 'styled-components';
-import { sendMessage } from '../services/api';
+import { streamMessage } from '../services/api';
 import { ChatMessage } from '../types';
 
 // Theme interface
@@ -272,13 +272,18 @@ const ChatbotWidget: React.FC = () => {
   ]);
   const [inputValue, setInputValue] = useState('');
   const [isLoading, setIsLoading] = useState(false);
+  const [isTyping, setIsTyping] = useState(false); // Waiting for the first token of a reply
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  const streamAbortRef = useRef<AbortController | null>(null);
 
   const scrollToBottom = () => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
   };
 
-  useEffect(scrollToBottom, [messages, isLoading]); // Scroll on new messages or loading state change
+  useEffect(scrollToBottom, [messages, isTyping]); // Scroll on new messages or typing indicator change
+
+  // Abort an in-flight reply on unmount so the backend stops generating it
+  useEffect(() => () => streamAbortRef.current?.abort(), []);
 
   const toggleChat = () => setIsOpen(!isOpen);
 
@@ -300,23 +305,41 @@ const ChatbotWidget: React.FC = () => {
     setMessages(prev => [...prev, newUserMessage]);
     setInputValue('');
     setIsLoading(true);
+    setIsTyping(true);
+
+    const botMessageId = (Date.now() + 1).toString();
+    const setBotText = (update: (text: string) => string) => {
+      setMessages(prev => prev.map(msg => msg.id === botMessageId ? { ...msg, text: update(msg.text) } : msg));
+    };
+
+    const abortController = new AbortController();
+    streamAbortRef.current = abortController;
 
     try {
-      const response = await sendMessage(userMessageText);
-      let botReplyText = "Sorry, I couldn't get a response. Please check the backend connection or API token."; // Default error
-      if (response.success && response.reply) {
-         botReplyText = response.reply;
-      } else if (response.message) {
-         botReplyText = `Error: ${response.message}`; // Show backend error message
+      let receivedFirstToken = false;
+      const response = await streamMessage(userMessageText, (token) => {
+        if (!receivedFirstToken) {
+          // Replace the typing indicator with the reply as soon as the first token arrives
+          receivedFirstToken = true;
+          setIsTyping(false);
+          setMessages(prev => [...prev, { id: botMessageId, text: token, sender: 'bot' }]);
+        } else {
+          setBotText(text => text + token);
+        }
+      }, abortController.signal);
+
+      if (!response.success) {
+        let botReplyText = "Sorry, I couldn't get a response. Please check the backend connection or API token."; // Default error
+        if (response.message) {
+           botReplyText = `Error: ${response.message}`; // Show backend error message
+        }
+        if (receivedFirstToken) {
+          setBotText(text => `${text}\n\n${botReplyText}`);
+        } else {
+          setMessages(prev => [...prev, { id: botMessageId, text: botReplyText, sender: 'bot' }]);
+        }
       }
 
-      const newBotMessage: ChatMessage = {
-        id: (Date.now() + 1).toString(),
-        text: botReplyText,
-        sender: 'bot',
-      };
-      setMessages(prev => [...prev, newBotMessage]);
-
     } catch (error) {
        console.error("Error sending message:", error);
        const errorBotMessage: ChatMessage = {
@@ -326,6 +349,8 @@ const ChatbotWidget: React.FC = () => {
        };
        setMessages(prev => [...prev, errorBotMessage]);
     } finally {
+      streamAbortRef.current = null;
+      setIsTyping(false);
       setIsLoading(false);
     }
   };
@@ -354,7 +379,7 @@ const ChatbotWidget: React.FC = () => {
              </MessageBubble>
              // Simple version: <MessageBubble key={msg.id} sender={msg.sender}>{msg.text}</MessageBubble>
           ))}
-          {isLoading && (
+          {isTyping && (
             <TypingIndicator>
               <span></span><span></span><span></span>
             </TypingIndicator>
@@ -1,5 +1,6 @@
 import React, { useRef, useEffect, useState } from 'react';
 import styled from 'styled-components';
+import { BoundaryGrid, BoundaryPoint } from '../types';
 // THREE.js functionality has been removed to fix TypeScript errors
 
 // Types
@@ -1447,4 +1448,152 @@ export const NeuralNetworkVisualizer: React.FC<NeuralNetworkVisualizerProps> = (
       </LegendContainer>
     </VisualizerContainer>
   );
-}; 
\ No newline at end of file
+};
+
+// --- Decision boundary rendering from quantized probability grids ---
+
+const BoundaryCanvas = styled.canvas`
+  width: 100%;
+  border-radius: 10px;
+  margin-top: 15px;
+  border: 1px solid rgba(0, 150, 255, 0.3);
+  background: black;
+  box-shadow: 0 8px 25px rgba(0, 0, 0, 0.3), 0 0 30px rgba(0, 100, 255, 0.15);
+`;
+
+const base64ToBytes = (data: string): Uint8Array => {
+  const binary = atob(data);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+};
+
+const inflate = async (bytes: Uint8Array): Promise<Uint8Array> => {
+  // zlib stream as produced by Python's zlib.compress ('deflate' in the Compression Streams API)
+  const Decompression = (window as any).DecompressionStream;
+  if (typeof Decompression !== 'function') {
+    throw new Error('DecompressionStream is not supported in this browser');
+  }
+  const stream = new Blob([bytes]).stream().pipeThrough(new Decompression('deflate'));
+  return new Uint8Array(await new Response(stream).arrayBuffer());
+};
+
+// Decode one grid frame; delta frames are applied on top of the previously decoded grid.
+export const decodeBoundaryGrid = async (grid: BoundaryGrid, previous?: Uint8Array): Promise<Uint8Array> => {
+  const values = await inflate(base64ToBytes(grid.data));
+  if (grid.encoding === 'uint8-delta-zlib') {
+    if (!previous) {
+      throw new Error('Delta frame without a preceding keyframe');
+    }
+    for (let i = 0; i < values.length; i++) {
+      values[i] = (previous[i] + values[i]) & 0xff;
+    }
+  }
+  return values;
+};
+
+// Red (0) -> near white (0.5) -> blue (1), close to matplotlib's RdBu
+const RDBU_STOPS: [number, number, number][] = [
+  [178, 24, 43], [239, 138, 98], [247, 247, 247], [103, 169, 207], [33, 102, 172]
+];
+
+const probabilityColor = (value: number): [number, number, number] => {
+  const position = (value / 255) * (RDBU_STOPS.length - 1);
+  const index = Math.min(Math.floor(position), RDBU_STOPS.length - 2);
+  const t = position - index;
+  const [from, to] = [RDBU_STOPS[index], RDBU_STOPS[index + 1]];
+  return [0, 1, 2].map(c => from[c] + (to[c] - from[c]) * t) as [number, number, number];
+};
+
+const drawBoundaryGrid = (
+  canvas: HTMLCanvasElement,
+  grid: BoundaryGrid,
+  values: Uint8Array,
+  points: BoundaryPoint[]
+) => {
+  const { width, height } = grid;
+  const [xMin, xMax, yMin, yMax] = grid.extent;
+
+  // Paint the grid at its native resolution, flipping rows so y grows upwards
+  const source = document.createElement('canvas');
+  source.width = width;
+  source.height = height;
+  const sourceCtx = source.getContext('2d');
+  const ctx = canvas.getContext('2d');
+  if (!sourceCtx || !ctx) return;
+
+  const image = sourceCtx.createImageData(width, height);
+  for (let row = 0; row < height; row++) {
+    for (let col = 0; col < width; col++) {
+      const value = values[row * width + col];
+      const offset = ((height - 1 - row) * width + col) * 4;
+      // Cells where the class flips relative to a neighbour form the 0.5 contour
+      const right = col + 1 < width ? values[row * width + col + 1] : value;
+      const up = row + 1 < height ? values[(row + 1) * width + col] : value;
+      const onBoundary = (value >= 128) !== (right >= 128) || (value >= 128) !== (up >= 128);
+      const [r, g, b] = onBoundary ? [255, 255, 255] : probabilityColor(value);
+      image.data[offset] = r;
+      image.data[offset + 1] = g;
+      image.data[offset + 2] = b;
+      image.data[offset + 3] = onBoundary ? 255 : 180;
+    }
+  }
+  sourceCtx.putImageData(image, 0, 0);
+
+  ctx.fillStyle = 'black';
+  ctx.fillRect(0, 0, canvas.width, canvas.height);
+  ctx.imageSmoothingEnabled = true;
+  ctx.drawImage(source, 0, 0, canvas.width, canvas.height);
+
+  // Training points on top, coloured like the server-rendered plot
+  for (const [x, y, label] of points) {
+    const px = ((x - xMin) / (xMax - xMin)) * canvas.width;
+    const py = canvas.height - ((y - yMin) / (yMax - yMin)) * canvas.height;
+    ctx.beginPath();
+    ctx.arc(px, py, 5, 0, 2 * Math.PI);
+    ctx.fillStyle = label === 1 ? 'rgba(0, 255, 136, 0.8)' : 'rgba(255, 85, 102, 0.8)';
+    ctx.fill();
+    ctx.lineWidth = 1.5;
+    ctx.strokeStyle = 'white';
+    ctx.stroke();
+  }
+};
+
+interface DecisionBoundaryCanvasProps {
+  grid: BoundaryGrid;
+  // Already decoded values; decoded from `grid` otherwise
+  values?: Uint8Array;
+  // Training points (see getBoundaryPoints); falls back to grid.points
+  points?: BoundaryPoint[];
+  width?: number;
+  height?: number;
+}
+
+export const DecisionBoundaryCanvas: React.FC<DecisionBoundaryCanvasProps> = ({
+  grid,
+  values,
+  points,
+  width = 640,
+  height = 512
+}) => {
+  const canvasRef = useRef<HTMLCanvasElement | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const decoded = values ? Promise.resolve(values) : decodeBoundaryGrid(grid);
+    decoded
+      .then(result => {
+        if (!cancelled && canvasRef.current) {
+          drawBoundaryGrid(canvasRef.current, grid, result, points || grid.points || []);
+        }
+      })
+      .catch(error => console.error('Failed to decode decision boundary grid:', error));
+    return () => {
+      cancelled = true;
+    };
+  }, [grid, values, points]);
+
+  return <BoundaryCanvas ref={canvasRef} width={width} height={height} aria-label="Decision Boundary" />;
+};
@@ -23,10 +23,11 @@ import {
 import NavigateBeforeIcon from '@mui/icons-material/NavigateBefore';
 import NavigateNextIcon from '@mui/icons-material/NavigateNext';
 
-import { NeuralNetworkVisualizer } from '../components/NeuralNetworkVisualizer';
+import { NeuralNetworkVisualizer, DecisionBoundaryCanvas } from '../components/NeuralNetworkVisualizer';
 import { 
   TrainingStatus,
   TrainingFormData,
+  BoundaryPoint,
 } from '../types';
 import { 
   startTraining, 
@@ -34,7 +35,8 @@ import {
   saveModel, 
   getModelState, 
   getSessions,
-  replaySession
+  replaySession,
+  getBoundaryPoints
 } from '../services/api';
 
 // Register Chart.js components
@@ -1267,6 +1269,8 @@ const TrainingPage: React.FC = () => {
   });
 
   // History state for charts
+  // Training points for grid boundaries, fetched once per session
+  const [boundaryPoints, setBoundaryPoints] = useState<{ sessionId?: string; points: BoundaryPoint[] } | null>(null);
   const [lossHistory, setLossHistory] = useState<number[]>([]);
   const [accuracyHistory, setAccuracyHistory] = useState<number[]>([]);
   const [epochLabels, setEpochLabels] = useState<string[]>([]);
@@ -1281,6 +1285,20 @@ const TrainingPage: React.FC = () => {
     }
   }, [lossHistory.length]);
 
+  // Grid boundaries arrive without training points; fetch them once per session
+  // decision_boundary is null before the first frame and from /api/model/state
+  const hasGridBoundary = !!trainingStatus.decision_boundary &&
+    typeof trainingStatus.decision_boundary === 'object' && !!trainingStatus.decision_boundary.grid;
+  useEffect(() => {
+    if (!hasGridBoundary || (boundaryPoints && boundaryPoints.sessionId === trainingStatus.session_id)) {
+      return;
+    }
+    const sessionId = trainingStatus.session_id;
+    getBoundaryPoints()
+      .then(data => setBoundaryPoints({ sessionId, points: data.points }))
+      .catch(error => console.error('Failed to fetch boundary points:', error));
+  }, [hasGridBoundary, trainingStatus.session_id, boundaryPoints]);
+
   // Handle form input changes
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const { name, value } = e.target;
@@ -1899,6 +1917,19 @@ const TrainingPage: React.FC = () => {
       );
     }
 
+    // Quantized probability grid: the image is drawn client-side
+    if (typeof trainingStatus.decision_boundary === 'object' && trainingStatus.decision_boundary.grid) {
+      return (
+        <DecisionBoundaryContainer>
+          <BoundaryTitle>Decision Boundary</BoundaryTitle>
+          <DecisionBoundaryCanvas
+            grid={trainingStatus.decision_boundary.grid}
+            points={boundaryPoints?.points}
+          />
+        </DecisionBoundaryContainer>
+      );
+    }
+
     // Extract the image string depending on the format
     let imageData: string;
     if (typeof trainingStatus.decision_boundary === 'string') {
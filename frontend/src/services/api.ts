@@ -12,7 +12,15 @@ import {
   SessionData,
   TrainingFormData,
   PredictionFormData,
-  ChatResponse
+  ChatResponse,
+  ChatStreamEvent,
+  LossLandscape,
+  LossLandscapeRequest,
+  DatasetInspection,
+  DatasetMeta,
+  ReplayExportJob,
+  ReplayExportOptions,
+  BoundaryPoint
 } from '../types';
 
 const API_URL = process.env.REACT_APP_API_URL || '';
@@ -26,19 +34,71 @@ const api = axios.create({
 });
 
 // EDA endpoints
-export const fetchEDA = async (): Promise<EDAData> => {
-  const response = await api.get<ApiResponse<EDAData>>('/api/eda');
+export const fetchEDA = async (datasetId?: string): Promise<EDAData> => {
+  const response = await api.get<ApiResponse<EDAData>>('/api/eda', {
+    params: datasetId ? { dataset_id: datasetId } : undefined
+  });
   if (response.data.success && response.data.data) {
     return response.data.data;
   }
   throw new Error(response.data.message || 'Failed to fetch EDA data');
 };
 
+// Dataset registry endpoints
+export const inspectDataset = async (file: File): Promise<DatasetInspection> => {
+  const formData = new FormData();
+  formData.append('dataset_file', file);
+  const response = await api.post<ApiResponse<DatasetInspection>>('/api/datasets/inspect', formData, {
+    headers: { 'Content-Type': 'multipart/form-data' }
+  });
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to read dataset');
+};
+
+export const uploadDataset = async (
+  file: File,
+  featureColumns: [string, string],
+  labelColumn: string,
+  name?: string
+): Promise<DatasetMeta> => {
+  const formData = new FormData();
+  formData.append('dataset_file', file);
+  featureColumns.forEach(column => formData.append('feature_columns', column));
+  formData.append('label_column', labelColumn);
+  if (name) {
+    formData.append('name', name);
+  }
+  const response = await api.post<ApiResponse<DatasetMeta>>('/api/datasets', formData, {
+    headers: { 'Content-Type': 'multipart/form-data' }
+  });
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to upload dataset');
+};
+
+export const listDatasets = async (): Promise<DatasetMeta[]> => {
+  const response = await api.get<ApiResponse<DatasetMeta[]>>('/api/datasets');
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to list datasets');
+};
+
+// Grid boundaries are zlib-compressed and need the Compression Streams API;
+// browsers without it get server-rendered PNG frames instead
+export const supportsGridBoundaries = (): boolean =>
+  typeof window !== 'undefined' && typeof (window as any).DecompressionStream === 'function';
+
 // Training endpoints
 export const startTraining = async (formData: TrainingFormData): Promise<string> => {
   try {
     // Always add a fixed hidden_units = 2 since the architecture is hardcoded in the backend
     const response = await api.post<TrainResponse>('/api/train', {
+      // Decision boundaries are drawn client-side from probability grids where supported
+      boundary_format: supportsGridBoundaries() ? 'grid' : 'png',
       ...formData,
       hidden_units: 2 // Fixed value to match [2,2,1] architecture
     });
@@ -62,6 +122,17 @@ export const getTrainingStatus = async (): Promise<TrainingStatus> => {
   throw new Error(response.data.message || 'Failed to fetch training status');
 };
 
+// Training points for grid boundaries; constant for a session, so fetch once per session_id
+export const getBoundaryPoints = async (): Promise<{ session_id?: string; points: BoundaryPoint[] }> => {
+  const response = await api.get<ApiResponse<{ session_id?: string; points: BoundaryPoint[] }>>(
+    '/api/train/boundary-points'
+  );
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to fetch boundary points');
+};
+
 // Prediction endpoints
 export const predict = async (formData: PredictionFormData): Promise<PredictionResult> => {
   const response = await api.post<ApiResponse<PredictionResult>>('/api/predict', formData);
@@ -72,14 +143,25 @@ export const predict = async (formData: PredictionFormData): Promise<PredictionR
 };
 
 // Evaluation endpoints
-export const evaluate = async (): Promise<EvaluationResult> => {
-  const response = await api.get<ApiResponse<EvaluationResult>>('/api/evaluate');
+export const evaluate = async (
+  options: { curves?: boolean; threshold?: number; bins?: number } = {}
+): Promise<EvaluationResult> => {
+  const response = await api.get<ApiResponse<EvaluationResult>>('/api/evaluate', { params: options });
   if (response.data.success && response.data.data) {
     return response.data.data;
   }
   throw new Error(response.data.message || 'Failed to evaluate model');
 };
 
+// Set the serving threshold to a probability or to the best-F1 threshold on the training split
+export const setThreshold = async (threshold: number | 'best_f1'): Promise<EvaluationResult> => {
+  const response = await api.post<ApiResponse<EvaluationResult>>('/api/threshold', { threshold });
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to set threshold');
+};
+
 // Model endpoints
 export const saveModel = async (): Promise<SaveModelResponse['data']> => {
   const response = await api.get<SaveModelResponse>('/api/save-model');
@@ -89,13 +171,43 @@ export const saveModel = async (): Promise<SaveModelResponse['data']> => {
   throw new Error('Failed to save model');
 };
 
+// Replay export: start a job, then poll it until status is 'done' and download
+export const exportSession = async (
+  sessionId: string,
+  options: ReplayExportOptions = {}
+): Promise<ReplayExportJob> => {
+  const response = await api.post<ApiResponse<ReplayExportJob>>(`/api/sessions/${sessionId}/export`, options);
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to start export');
+};
+
+export const getExportJob = async (jobId: string): Promise<ReplayExportJob> => {
+  const response = await api.get<ApiResponse<ReplayExportJob>>(`/api/exports/${jobId}`);
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to fetch export status');
+};
+
+export const getExportDownloadUrl = (job: ReplayExportJob): string => `${API_URL}${job.download_url}`;
+
+export const getLossLandscape = async (options: LossLandscapeRequest = {}): Promise<LossLandscape> => {
+  const response = await api.post<ApiResponse<LossLandscape>>('/api/loss-landscape', options);
+  if (response.data.success && response.data.data) {
+    return response.data.data;
+  }
+  throw new Error(response.data.message || 'Failed to compute loss landscape');
+};
+
 export const getModelState = async (): Promise<{
   weights: any;
   biases: any;
   decision_boundary?: {
     epoch: number;
     image: string;
-  };
+  } | null;
 }> => {
   const response = await api.get<ApiResponse<{
     weights: any;
@@ -103,7 +215,7 @@ export const getModelState = async (): Promise<{
     decision_boundary?: {
       epoch: number;
       image: string;
-    };
+    } | null;
   }>>('/api/model/state');
   if (response.data.success && response.data.data) {
     return response.data.data;
@@ -157,4 +269,63 @@ export const sendMessage = async (message: string): Promise<ChatResponse> => {
     return { success: false, message: 'Failed to connect to the chat service.' };
   }
 };
+
+// Streams the reply token by token from /api/chat/stream (newline-delimited JSON).
+// Aborting `signal` closes the connection, which stops generation on the server.
+export const streamMessage = async (
+  message: string,
+  onToken: (token: string) => void,
+  signal?: AbortSignal
+): Promise<ChatResponse> => {
+  let response: Response;
+  try {
+    response = await fetch(`${API_URL}/api/chat/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ message }),
+      signal,
+    });
+  } catch (error) {
+    console.error('Error streaming message:', error);
+    return { success: false, message: 'Failed to connect to the chat service.' };
+  }
+
+  if (!response.ok || !response.body) {
+    try {
+      return (await response.json()) as ChatResponse;
+    } catch {
+      return { success: false, message: 'Failed to connect to the chat service.' };
+    }
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '';
+  let reply = '';
+
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffered += decoder.decode(value, { stream: true });
+
+    const lines = buffered.split('\n');
+    buffered = lines.pop() || '';
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const event = JSON.parse(line) as ChatStreamEvent;
+      if (event.error) {
+        return { success: false, message: event.error, reply };
+      }
+      if (event.token) {
+        reply += event.token;
+        onToken(event.token);
+      }
+      if (event.done) {
+        return { success: true, reply };
+      }
+    }
+  }
+
+  return { success: false, message: 'The chat stream ended unexpectedly.', reply };
+};
 // --- End New Chatbot API Function ---
\ No newline at end of file
@@ -8,6 +8,27 @@ export interface NetworkLayer {
   type: 'input' | 'hidden' | 'output';
 }
 
+// Quantized probability grid sent instead of a PNG when training with boundary_format 'grid'.
+// Delta frames hold the byte-wise difference (mod 256) from the previous frame in a history.
+export interface BoundaryGrid {
+  encoding: 'uint8-zlib' | 'uint8-delta-zlib';
+  width: number;
+  height: number;
+  extent: [number, number, number, number]; // x_min, x_max, y_min, y_max
+  data: string; // base64 of zlib-compressed uint8 rows, y_min first
+  points?: BoundaryPoint[]; // only on the first recorded frame of a session
+}
+
+// [x, y, label] of a training point drawn over the boundary
+export type BoundaryPoint = [number, number, number];
+
+export interface DecisionBoundaryFrame {
+  epoch: number;
+  initial?: boolean; // Recorded before training; shares epoch 0 with the first trained frame
+  image?: string;
+  grid?: BoundaryGrid;
+}
+
 export interface TrainingHistory {
   loss: number[];
   accuracy: number[];
@@ -17,10 +38,7 @@ export interface TrainingHistory {
   biases: {
     [key: string]: number[][];
   }[];
-  decision_boundaries: {
-    epoch: number;
-    image: string;
-  }[];
+  decision_boundaries: DecisionBoundaryFrame[];
 }
 
 export interface TrainingStatus {
@@ -34,10 +52,8 @@ export interface TrainingStatus {
   biases?: Record<string, number[][]>;
   current_weights?: Record<string, number[][]>;
   current_biases?: Record<string, number[][]>;
-  decision_boundary?: string | {
-    epoch: number;
-    image: string;
-  };
+  decision_boundary?: string | DecisionBoundaryFrame | null;
+  session_id?: string;
 }
 
 export interface SessionData {
@@ -50,39 +66,67 @@ export interface SessionData {
   biases: Record<string, number[][]>[];
   losses: number[];
   accuracies: number[];
-  decision_boundaries?: {
-    epoch: number;
-    image: string;
-  }[];
+  decision_boundaries?: DecisionBoundaryFrame[];
   timestamp: string;
 }
 
+export interface FeatureStats {
+  mean: number;
+  median: number;
+  min: number;
+  max: number;
+}
+
 export interface EDAStats {
   total_samples: number;
-  placement_rate: number;
+  placement_rate: number; // positive-class rate; kept for the placement dataset
+  positive_rate?: number;
   train_test_split: string;
-  features: {
-    cgpa: {
-      mean: number;
-      median: number;
-      min: number;
-      max: number;
-    };
-    iq: {
-      mean: number;
-      median: number;
-      min: number;
-      max: number;
-    };
-  };
+  feature_columns?: string[];
+  label_column?: string;
+  // Keyed by feature column: cgpa and iq for the bundled dataset
+  features: Record<string, FeatureStats>;
 }
 
+// One `${feature}_hist` histogram per feature column plus the scatter plot
 export interface EDAPlots {
-  cgpa_hist: string;
-  iq_hist: string;
+  [name: string]: string;
   scatter_plot: string;
 }
 
+// Uploaded dataset registry (/api/datasets)
+export interface DatasetColumn {
+  name: string;
+  dtype: string;
+  numeric: boolean;
+  missing: number;
+  unique: number;
+}
+
+export interface DatasetInspection {
+  rows: number;
+  columns: DatasetColumn[];
+  feature_candidates: string[];
+  label_candidates: string[];
+}
+
+export interface DatasetMeta {
+  dataset_id: string;
+  name: string;
+  feature_columns: string[];
+  label_column: string;
+  label_values: [string, string]; // original values mapped to classes 0 and 1
+  rows: number;
+  train_rows: number;
+  test_rows: number;
+  positive_rate: number;
+  test_size: number;
+  random_state: number;
+  scaler: { mean: number[]; scale: number[] };
+  fingerprint: string;
+  content_sha256: string;
+}
+
 export interface EDAData {
   stats: EDAStats;
   plots: EDAPlots;
@@ -100,6 +144,7 @@ export interface PredictionResult {
     cgpa: number;
     iq: number;
   };
+  threshold: number;
 }
 
 export interface EvaluationResult {
@@ -113,6 +158,42 @@ export interface EvaluationResult {
   precision: number;
   recall: number;
   f1_score: number;
+  threshold: number;
+  threshold_analysis?: ThresholdAnalysis;
+  tuned_on?: 'train' | null; // set by POST /api/threshold; 'best_f1' is tuned on the training split
+}
+
+// Threshold sweep over the test set, returned by /api/evaluate?curves=true.
+// The first ROC threshold is null: a threshold above every score.
+export interface ThresholdAnalysis {
+  positives: number;
+  negatives: number;
+  roc: {
+    thresholds: (number | null)[];
+    fpr: number[];
+    tpr: number[];
+    auc: number;
+  };
+  pr: {
+    thresholds: number[];
+    precision: number[];
+    recall: number[];
+    average_precision: number;
+  };
+  best_f1: {
+    threshold: number;
+    f1_score: number;
+    precision: number;
+    recall: number;
+  };
+  calibration: {
+    bin_edges: number[];
+    count: number[];
+    mean_predicted: number[];
+    fraction_positive: number[];
+    expected_calibration_error: number;
+    brier_score: number;
+  };
 }
 
 // API Response Types
@@ -158,6 +239,9 @@ export interface SessionsResponse {
 export interface TrainingFormData {
   learning_rate: number;
   epochs: number;
+  boundary_format?: 'png' | 'grid';
+  profile?: boolean; // Run the job under cProfile + tracemalloc
+  dataset_id?: string; // Registered dataset; the bundled CSV when omitted
 }
 
 export interface PredictionFormData {
@@ -165,6 +249,49 @@ export interface PredictionFormData {
   iq: number;
 }
 
+// Loss landscape over a 2D slice of parameter space (POST /api/loss-landscape).
+// Grids are indexed [beta][alpha]; offsets are the values of alpha and beta.
+export interface LossLandscapeRequest {
+  mode?: 'random' | 'weights';
+  axes?: [string, string];
+  span?: number;
+  resolution?: number;
+  seed?: number;
+  trajectory?: boolean;
+}
+
+export interface LossLandscape {
+  mode: 'random' | 'weights';
+  resolution: number;
+  span: number;
+  offsets: number[];
+  loss: number[][];
+  gradient: {
+    alpha: number[][];
+    beta: number[][];
+  };
+  center_loss: number;
+  loss_range: [number, number];
+  model_version: string;
+  axes?: { name: string; values: number[] }[];
+  seed?: number;
+  trajectory?: [number, number][];
+}
+
+// Background GIF/MP4 export of a recorded session (/api/sessions/<id>/export)
+export interface ReplayExportOptions {
+  format?: 'gif' | 'mp4';
+  fps?: number;
+  size?: number;
+}
+
+export interface ReplayExportJob {
+  job_id: string;
+  status: 'pending' | 'running' | 'done' | 'failed';
+  error: string | null;
+  download_url: string;
+}
+
 // Chatbot Types
 export interface ChatMessage {
   id: string;
@@ -176,4 +303,10 @@ export interface ChatResponse {
   success: boolean;
   reply?: string;
   message?: string;
-}
\ No newline at end of file
+}
+
+export interface ChatStreamEvent {
+  token?: string;
+  done?: boolean;
+  error?: string;
+}